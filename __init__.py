@@ -13,45 +13,63 @@
 # limitations under the License.
 
 import time
-from datetime import datetime
+from datetime import datetime, timezone
 import os
-import subprocess
 from threading import Thread, Lock
 
-from pytz import timezone
-import arrow
-import astral
-import pyaudio
-
-from mycroft.configuration.config import LocalConf, USER_CONFIG, Configuration
 from mycroft.messagebus.message import Message
+from mycroft.skills.settings import save_settings
 from mycroft.util import get_ipc_directory
 from mycroft.util.log import LOG
-from mycroft.util.parse import normalize
 from mycroft import MycroftSkill, intent_handler
 
-from .skill.device_id import get_device_name, get_mycroft_uuid, get_pantacor_device_id
-from .skill.versions import (
-    get_mycroft_build_datetime,
-    get_mycroft_core_commit,
-    get_mycroft_core_version,
-    get_skill_update_datetime,
+from .skill.brightness import (
+    AUTO,
+    INVALID,
+    BrightnessController,
+    BrightnessParser,
+    find_brightness_sink,
+)
+from .skill.busy import BUSY_DELAY, BusyTracker
+from .skill.config_writer import CONFIG_SETTINGS, ConfigWriter
+from .skill.device_info import DeviceInfoCache
+from .skill.dispatch import MessageDispatcher
+from .skill.gui import GuiUpdate
+from .skill.metrics import HandlerMetrics
+from .skill.overrides import IdleOverrideStack
+from .skill.power import ShutdownCoordinator
+from .skill.scheduler import DeadlineScheduler
+from .skill.screens import ScreenRegistry, load_snapshot, save_snapshot
+from .skill.solar import BRIGHTNESS_EVENTS, SolarSchedule
+from .skill.speaking import SpeakingSession
+from .skill.sprites import load_sprite
+from .skill.visemes import EMPTY_VISEMES, VisemeStreamer
+from .skill.volume import VOLUME_EVENTS, VolumeOverlay
+
+# Handlers whose start and completion do not affect the busy visual: the
+# handlers of this skill and the background clock.
+IGNORED_HANDLERS = ("Mark2", "TimeSkill.update_display")
+
+# Handlers measured when the "metrics_enabled" setting is on
+MEASURED_HANDLERS = (
+    "on_gui_page_show",
+    "on_gui_page_interaction",
+    "on_handler_speaking",
+    "on_handler_started",
+    "start_idle_event",
 )
+METRICS_DUMP_INTERVAL = 60  # Seconds
 
+# Seconds the thinking animation stays after the last handler completed,
+# speech queued by the handler replaces it meanwhile
+BUSY_SETTLE = 2
 
-def compare_origin(msg1, msg2):
-    """Compare the origin Skill of two Messages.
+BRIGHTNESS_RECHECK = 3600  # Longest wait in seconds before checking the clock
 
-    Arguments:
-        message (Message): Mycroft Message to compare
-        message (Message): Mycroft Message to compare
+# Pages of all.qml kept ready to show, the speaking face first of all
+PRELOADED_PAGES = ("speaking", "thinking")
 
-    Returns:
-        bool: Whether the Messages originate from the same Skill.
-    """
-    origin1 = msg1.data["__from"] if isinstance(msg1, Message) else msg1
-    origin2 = msg2.data["__from"] if isinstance(msg2, Message) else msg2
-    return origin1 == origin2
+SNAPSHOT_DELAY = 1  # Seconds to wait for more registrations before saving
 
 
 class RestingScreen:
@@ -59,19 +77,33 @@ class RestingScreen:
 
     This class handles registration and override of resting screens,
     encapsulating the system.
+
+    When a snapshot path is given the registered screens are saved there
+    and restored when the skill is reloaded, so the resting screen can be
+    shown before the Skills answer the collection request.
     """
 
-    def __init__(self, bus, gui, log, settings):
+    def __init__(self, bus, gui, log, settings, scheduler, snapshot_path=None):
         self.bus = bus
         self.gui = gui
         self.log = log
         self.settings = settings
+        self.scheduler = scheduler
+        self.snapshot_path = snapshot_path
 
-        self.screens = {}
-        self.override_idle = None
+        self.screens = ScreenRegistry()
+        self.overrides = IdleOverrideStack()
         self.next = 0  # Next time the idle screen should trigger
         self.lock = Lock()
-        self.override_set_time = time.monotonic()
+        self.collecting = False
+        self.pending = set()  # Screens expected to answer the collect request
+        self.expecting = False  # Whether pending was known when collecting
+        self.displayed = None  # (origin, pages) of the page on screen
+        self.suppressed_redraws = 0
+        self.last_shown = None  # Name of the last resting screen shown
+        self.unconfirmed = set()  # Restored screens not registered again yet
+        if snapshot_path is not None:
+            self._load_snapshot()
 
         # Preselect Homescreen Skill as resting screen
         if "selected" not in self.settings:
@@ -81,12 +113,78 @@ class RestingScreen:
 
     def on_register(self, message):
         """Handler for catching incoming idle screens."""
-        if "name" in message.data and "id" in message.data:
-            self.screens[message.data["name"]] = message.data["id"]
-            self.log.info("Registered {}".format(message.data["name"]))
+        self._register(message.data)
+
+    def on_register_bulk(self, message):
+        """Register several idle screens from one message.
+
+        The message data holds a "screens" list of registrations.
+        """
+        for registration in message.data.get("screens", []):
+            self._register(registration)
+
+    def _register(self, registration):
+        if "name" in registration and "id" in registration:
+            name = registration["name"]
+            changed = self.screens.register(
+                name, registration["id"], registration.get("__from")
+            )
+            self.log.info("Registered {}".format(name))
+            self.unconfirmed.discard(name)
+            if changed:
+                self._save_snapshot_later()
+            if self.collecting:
+                self.pending.discard(name)
+                if name == self.gui["selected"] or (
+                    self.expecting and not self.pending
+                ):
+                    self.end_collect()
         else:
             self.log.error("Malformed idle screen registration received")
 
+    def on_skill_detached(self, message):
+        """Drop the idle screens of a Skill being unloaded."""
+        # Skills report their id with a trailing ":" when detaching
+        skill_id = message.data.get("skill_id", "").rstrip(":")
+        for name in self.screens.remove_owner(skill_id):
+            self.log.info("Unregistered {}".format(name))
+            self._save_snapshot_later()
+
+    def _load_snapshot(self):
+        """Restore the screens registered before the skill was reloaded."""
+        entries, self.last_shown = load_snapshot(self.snapshot_path)
+        for name, entry in entries:
+            self.screens.register(name, *entry)
+        self.unconfirmed = set(self.screens)
+        if entries:
+            self.log.info("Restored {} resting screens".format(len(self.screens)))
+
+    def _save_snapshot_later(self):
+        if self.snapshot_path is not None:
+            self.scheduler.schedule("IdleSnapshot", SNAPSHOT_DELAY, self._save_snapshot)
+
+    def flush_snapshot(self):
+        """Save a pending snapshot change now."""
+        if self.scheduler.remaining("IdleSnapshot") is not None:
+            self.scheduler.cancel("IdleSnapshot")
+            self._save_snapshot()
+
+    def _save_snapshot(self):
+        try:
+            save_snapshot(self.snapshot_path, self.screens, self.last_shown)
+        except OSError:
+            self.log.exception("Failed to save the resting screens")
+
+    def _reconcile(self):
+        """Drop restored screens whose Skill did not register them again."""
+        with self.lock:
+            stale, self.unconfirmed = self.unconfirmed, set()
+        for name in stale:
+            if self.screens.remove(name):
+                self.log.info("Dropped stale resting screen {}".format(name))
+        if stale:
+            self._save_snapshot_later()
+
     def save(self):
         """Handler to be called if the settings are changed by the GUI.
 
@@ -97,11 +195,63 @@ class RestingScreen:
         self.gui["selectedScreen"] = self.gui["selected"]
 
     def collect(self):
-        """Trigger collection and then show the resting screen."""
+        """Trigger collection of the resting screens.
+
+        The selected resting screen is shown as soon as its Skill registers,
+        or when the collection deadline expires, whichever comes first.
+        Screens restored from the snapshot are shown right away and dropped
+        at the deadline if their Skill did not register them again.
+        """
+        timeout = self.settings.get("collect_idle_timeout", 2)
+        with self.lock:
+            self.collecting = True
+            self.pending = set(self.screens)
+            # Without known screens, wait for the selected one or the deadline
+            self.expecting = bool(self.pending)
+            warm = bool(self.unconfirmed)
+        self.scheduler.schedule("CollectIdle", timeout, self.end_collect)
         self.bus.emit(Message("mycroft.mark2.collect_idle"))
-        time.sleep(1)
+        if warm:
+            self.scheduler.schedule("IdleReconcile", timeout, self._reconcile)
+            self.show()
+
+    def end_collect(self):
+        """Finish an ongoing collection and show the resting screen."""
+        with self.lock:
+            if not self.collecting:
+                return
+            self.collecting = False
+            self.pending = set()
+            self.expecting = False
+        self.scheduler.cancel("CollectIdle")
         self.show()
 
+    def on_page_shown(self, message):
+        """Track the page on screen from gui.page.show messages."""
+        self.displayed = (
+            message.data.get("__from"),
+            tuple(message.data.get("page") or ()),
+        )
+
+    def on_namespace_cleared(self, message):
+        """Forget the page on screen when its namespace is removed."""
+        origin = message.data.get("__from") or message.data.get("skill_id")
+        if self.displayed is not None and self.displayed[0] == origin:
+            self.displayed = None
+
+    def _is_displayed(self, origin, pages=None):
+        """Check if a page of a Skill is on screen.
+
+        Arguments:
+            origin (str): Skill id of the page
+            pages (tuple): pages to check, None to check for an idle page
+        """
+        if self.displayed is None or self.displayed[0] != origin:
+            return False
+        if pages is None:
+            return any(page.endswith("idle.qml") for page in self.displayed[1])
+        return self.displayed[1] == tuple(pages)
+
     def set(self, message):
         """Set selected idle screen from message."""
         self.gui["selected"] = message.data["selected"]
@@ -111,44 +261,103 @@ class RestingScreen:
         """Show the idle screen or return to the skill that's overriding idle."""
         self.log.debug("Showing idle screen")
         screen = None
-        if self.override_idle:
+        with self.lock:
+            # A pending idle check would only show the same screen again.
+            # Forget its time too, the next page may arm a shorter one.
+            self.next = 0
+            self.scheduler.cancel("IdleCheck")
+            active_override = self.overrides.top()
+        if active_override is not None:
+            if self._is_displayed(
+                active_override.origin, active_override.message.data.get("page")
+            ):
+                self.suppressed_redraws += 1
+                self.log.debug("Override screen already shown")
+                return
             self.log.debug("Returning to override idle screen")
             # Restore the page overriding idle instead of the normal idle
-            self.bus.emit(self.override_idle[0])
+            self.bus.emit(active_override.message)
         elif len(self.screens) > 0 and "selected" in self.gui:
             # TODO remove hard coded value
             self.log.info("Showing Idle screen for " "{}".format(self.gui["selected"]))
-            screen = self.screens.get(self.gui["selected"])
+            name = self.gui["selected"]
+            if name not in self.screens and self.last_shown in self.screens:
+                name = self.last_shown
+            screen = self.screens.get(name)
+            if screen and name != self.last_shown:
+                self.last_shown = name
+                self._save_snapshot_later()
 
         self.log.debug(screen)
-        if screen:
+        if screen and self._is_displayed(screen):
+            self.suppressed_redraws += 1
+            self.log.debug("Idle screen already shown")
+        elif screen:
             self.bus.emit(Message("{}.idle".format(screen)))
 
-    def restore(self, _=None):
-        """Remove any override and show the selected resting screen."""
-        if self.override_idle and time.monotonic() - self.override_idle[1] > 2:
-            self.override_idle = None
+    def restore(self, message=None):
+        """Remove an override and show the next override or resting screen.
+
+        The override of the Skill sending the message is removed, or the
+        active override if that Skill has none.
+        """
+        origin = message.data.get("__from") if message else None
+        with self.lock:
+            if origin in self.overrides:
+                removed = self.overrides.remove(origin)
+            else:
+                removed = self.overrides.pop() is not None
+        if removed:
             self.show()
 
     def stop(self):
-        if time.monotonic() > self.override_set_time + 7:
-            self.restore()
+        """Drop the active override when the user asks to stop."""
+        self.restore()
 
-    def override(self, message=None):
+    def override(self, message):
         """Override the resting screen.
 
+        The data of the message may hold an "__idle_priority", overrides
+        with a higher priority win, and an "__idle_timeout" in seconds after
+        which the override expires.
+
         Arguments:
-            message: Optional message to use for to restore
-                     the expected override screen after
-                     another screen has been displayed.
+            message: message to use to restore the expected override
+                     screen after another screen has been displayed.
         """
-        self.override_set_time = time.monotonic()
-        if message:
-            self.override_idle = (message, time.monotonic())
+        with self.lock:
+            self.overrides.push(
+                message.data.get("__from"),
+                message,
+                message.data.get("__idle_priority", 0),
+                message.data.get("__idle_timeout"),
+            )
+            expiry = self.overrides.next_expiry()
+        if expiry is None:
+            self.scheduler.cancel("IdleOverrideExpiry")
+        else:
+            self.scheduler.schedule("IdleOverrideExpiry", expiry, self._expire_override)
+
+    def _expire_override(self):
+        """Show the next screen once the active override expired."""
+        with self.lock:
+            self.overrides.top()  # Drops expired overrides
+            expiry = self.overrides.next_expiry()
+        if expiry is not None:
+            self.scheduler.schedule("IdleOverrideExpiry", expiry, self._expire_override)
+        self.show()
+
+    def cancel_override(self, origin=None):
+        """Remove the override of a Skill without changing the screen.
 
-    def cancel_override(self):
-        """Remove the override screen."""
-        self.override_idle = None
+        Arguments:
+            origin (str): Skill id of the override, None removes them all
+        """
+        with self.lock:
+            if origin is None:
+                self.overrides.clear()
+            else:
+                self.overrides.remove(origin)
 
 
 class Mark2(MycroftSkill):
@@ -174,34 +383,110 @@ class Mark2(MycroftSkill):
         self.override_animations = False
         self.resting_screen = None
         self.auto_brightness = None
+        self.scheduler = DeadlineScheduler()
+        self.device_info = None
+        self.solar_schedule = SolarSchedule()
+        self.brightness = None
+        self.brightness_parser = None
+        self.visemes = None
+        self.speaking = None
+        self.showing_speaking = False
+        self.busy = None
+        self.showing_thinking = False
+        self.volume_overlay = None
+        self.dispatcher = None
+        self.metrics = None
+        self.config_writer = None
+        self.power = None
 
     def initialize(self):
         """Perform initalization.
 
         Registers messagebus handlers and sets default gui values.
         """
-        self.resting_screen = RestingScreen(self.bus, self.gui, self.log, self.settings)
+        self.resting_screen = RestingScreen(
+            self.bus,
+            self.gui,
+            self.log,
+            self.settings,
+            self.scheduler,
+            os.path.join(get_ipc_directory(), "mark2", "resting_screens.json"),
+        )
+        if self.settings.get("metrics_enabled", False):
+            self._enable_metrics()
+
+        self.brightness_parser = BrightnessParser(os.path.join(self.root_dir, "locale"))
+        self.brightness = BrightnessController(find_brightness_sink(), self.scheduler)
 
-        self.brightness_dict = self.translate_namedvalues("brightness.levels")
+        # Prepare the About page values off the bus thread
+        skills_repo_path = f"{self.config_core['data_dir']}/.skills-repo"
+        self.device_info = DeviceInfoCache(skills_repo_path, self._update_device_info)
+        self.device_info.refresh_async()
         self.gui["volume"] = 0
+        self.volume_overlay = VolumeOverlay(
+            self.gui, self.scheduler, self._is_page_shown
+        )
+        # Sprite sheet replacing the Lottie animation, if one was built
+        self.gui["thinkingSprite"] = load_sprite("thinking")
+        self.prewarm_pages(PRELOADED_PAGES)
 
         # Prepare GUI Viseme structure
-        self.gui["viseme"] = {"start": 0, "visemes": []}
+        self.gui["viseme"] = EMPTY_VISEMES
+        self.visemes = VisemeStreamer(self.gui, self.scheduler)
+        self.speaking = SpeakingSession(self.scheduler, self.on_speaking_end)
+        self.busy = BusyTracker(
+            self.scheduler,
+            self.on_busy,
+            self.on_busy_end,
+            self.settings.get("busy_delay", BUSY_DELAY),
+        )
 
         try:
             # Handle network connection events
             self.add_event("mycroft.internet.connected", self.handle_internet_connected)
 
             # Handle the 'busy' visual
-            self.bus.on("mycroft.skill.handler.start", self.on_handler_started)
-            self.bus.on("enclosure.mouth.reset", self.on_handler_mouth_reset)
-            self.bus.on("recognizer_loop:audio_output_end", self.on_handler_mouth_reset)
-            self.bus.on("enclosure.mouth.viseme_list", self.on_handler_speaking)
-            self.bus.on("gui.page.show", self.on_gui_page_show)
-            self.bus.on("gui.page_interaction", self.on_gui_page_interaction)
+            self.dispatcher = MessageDispatcher(self.bus)
+            self.dispatcher.add(
+                "mycroft.skill.handler.start",
+                self.on_handler_started,
+                ignored_handlers=IGNORED_HANDLERS,
+            )
+            self.dispatcher.add(
+                "mycroft.skill.handler.complete",
+                self.on_handler_complete,
+                ignored_handlers=IGNORED_HANDLERS,
+            )
+            self.dispatcher.add("enclosure.mouth.reset", self.on_handler_mouth_reset)
+            self.dispatcher.add(
+                "recognizer_loop:audio_output_start", self.speaking.on_audio_start
+            )
+            self.dispatcher.add(
+                "recognizer_loop:audio_output_end", self.speaking.on_audio_end
+            )
+            self.dispatcher.add(
+                "mycroft.audio.speech.stop", self.speaking.on_speech_stop
+            )
+            self.dispatcher.add("enclosure.mouth.viseme_list", self.on_handler_speaking)
+            for volume_event in VOLUME_EVENTS:
+                self.dispatcher.add(volume_event, self.volume_overlay.on_volume)
+            self.dispatcher.observe("gui.page.show", self.resting_screen.on_page_shown)
+            self.dispatcher.add(
+                "gui.page.show", self.on_gui_page_show, ignored_origins=[self.skill_id]
+            )
+            self.dispatcher.observe(
+                "gui.clear.namespace", self.resting_screen.on_namespace_cleared
+            )
+            self.dispatcher.add("gui.page_interaction", self.on_gui_page_interaction)
 
-            self.bus.on("mycroft.skills.initialized", self.reset_resting_screen)
-            self.bus.on("mycroft.mark2.register_idle", self.resting_screen.on_register)
+            self.dispatcher.add("mycroft.skills.initialized", self.reset_resting_screen)
+            self.dispatcher.add(
+                "mycroft.mark2.register_idle", self.resting_screen.on_register
+            )
+            self.dispatcher.add(
+                "mycroft.mark2.register_idle.bulk", self.resting_screen.on_register_bulk
+            )
+            self.dispatcher.add("detach_skill", self.resting_screen.on_skill_detached)
 
             self.add_event("mycroft.mark2.reset_idle", self.resting_screen.restore)
             # TODO move resting screen to Enclosure
@@ -209,6 +494,8 @@ class Mark2(MycroftSkill):
             # - this message is set to be consistent with a handler below.
             self.add_event("mycroft.device.show.idle", self.resting_screen.show)
 
+            self.add_event("mycroft.mark2.metrics", self.handle_metrics_query)
+
             # Handle device settings events
             self.add_event("mycroft.device.settings", self.handle_device_settings)
 
@@ -256,18 +543,36 @@ class Mark2(MycroftSkill):
             LOG.exception("In Mark 2 Skill")
 
         # Update use of wake-up beep
-        self._sync_wake_beep_setting()
+        self.config_writer = ConfigWriter(self.bus, self.scheduler)
+        self._sync_config_settings()
+
+        self.power = ShutdownCoordinator(
+            {
+                "settings": self._save_settings,
+                "configuration": self.config_writer.flush,
+                "resting screens": self.resting_screen.flush_snapshot,
+            }
+        )
 
         self.settings_change_callback = self.on_websettings_changed
+        # Resume auto brightness if it was enabled before the skill loaded
+        try:
+            if self.settings.get("auto_brightness"):
+                self.handle_auto_brightness(None)
+        except Exception:
+            LOG.exception("Failed to resume auto brightness")
 
     ###################################################################
     # System events
     def handle_system_reboot(self, _):
-        self.speak_dialog("rebooting", wait=True)
-        subprocess.call(["/usr/bin/systemctl", "reboot"])
+        self.power.run("reboot", lambda: self.speak_dialog("rebooting", wait=True))
 
     def handle_system_shutdown(self, _):
-        subprocess.call(["/usr/bin/systemctl", "poweroff"])
+        self.power.run("poweroff")
+
+    def _save_settings(self):
+        """Write the skill settings, normally only saved on skill shutdown."""
+        save_settings(self.settings_write_path, self.settings)
 
     def handle_remove_namespace(self, message):
         get_skill_namespace = message.data.get("skill_id", "")
@@ -275,8 +580,9 @@ class Mark2(MycroftSkill):
             self.bus.emit(
                 Message("gui.clear.namespace", {"__from": get_skill_namespace})
             )
-        self.resting_screen.cancel_override()
-        self.cancel_scheduled_event("IdleCheck")
+        self.resting_screen.cancel_override(get_skill_namespace or None)
+        self.resting_screen.on_namespace_cleared(message)
+        self.cancel_idle_event()
 
     ###################################################################
     # Idle screen mechanism
@@ -286,38 +592,49 @@ class Mark2(MycroftSkill):
 
         Triggered after skills are initialized.
         """
-        time.sleep(1)
         self.resting_screen.collect()
 
     def stop(self, _=None):
-        """Clear override_idle and stop visemes."""
+        """Drop the active idle override and stop visemes."""
         self.log.debug("Stop received")
         self.resting_screen.stop()
-        self.gui["viseme"] = {"start": 0, "visemes": []}
+        self.visemes.stop()
         return False
 
     def shutdown(self):
         """Cleanly shutdown the Skill removing any manual event handlers"""
         # Gotta clean up manually since not using add_event()
-        self.bus.remove("mycroft.skill.handler.start", self.on_handler_started)
-        self.bus.remove("enclosure.mouth.reset", self.on_handler_mouth_reset)
-        self.bus.remove("recognizer_loop:audio_output_end", self.on_handler_mouth_reset)
-        self.bus.remove("enclosure.mouth.viseme_list", self.on_handler_speaking)
-        self.bus.remove("gui.page.show", self.on_gui_page_show)
-        self.bus.remove("gui.page_interaction", self.on_gui_page_interaction)
-        self.bus.remove("mycroft.skills.initialized", self.reset_resting_screen)
-        self.bus.remove("mycroft.mark2.register_idle", self.resting_screen.on_register)
+        if self.dispatcher is not None:
+            self.dispatcher.shutdown()
+        # Write the changes still waiting for their deadline
+        if self.resting_screen is not None:
+            self.resting_screen.flush_snapshot()
+        if self.config_writer is not None:
+            self.config_writer.flush()
+        self.scheduler.shutdown()
 
     #####################################################################
     # Manage "busy" visual
 
     def on_handler_started(self, message):
-        handler = message.data.get("handler", "")
-        # Ignoring handlers from this skill and from the background clock
-        if "Mark2" in handler:
-            return
-        if "TimeSkill.update_display" in handler:
+        """Handler start of other skills, see IGNORED_HANDLERS."""
+        self.busy.start(message.data.get("handler", ""))
+
+    def on_busy(self):
+        """Show the thinking animation once a handler is slow to complete."""
+        if self.has_show_page or self.override_animations or self.speaking.active:
             return
+        self.cancel_idle_event()
+        with GuiUpdate(self.gui, "all.qml") as gui:
+            gui["state"] = "thinking"
+        self.showing_thinking = True
+
+    def on_busy_end(self):
+        """Leave the thinking animation when no handler is running anymore."""
+        if self.showing_thinking:
+            self.showing_thinking = False
+            # Leave time for the speech the handler may have queued
+            self.start_idle_event(BUSY_SETTLE)
 
     def on_gui_page_interaction(self, _):
         """Reset idle timer to 30 seconds when page is flipped."""
@@ -325,75 +642,73 @@ class Mark2(MycroftSkill):
         self.start_idle_event(30)
 
     def on_gui_page_show(self, message):
-        if "mark-2" not in message.data.get("__from", ""):
-            # Some skill other than the handler is showing a page
-            self.has_show_page = True
-
-            # If a skill overrides the animations do not show any
-            override_animations = message.data.get("__animations", False)
-            if override_animations:
-                # Disable animations
-                self.log.debug("Disabling all animations for page")
-                self.override_animations = True
-            else:
-                self.log.debug("Displaying all animations for page")
-                self.override_animations = False
-
-            # If a skill overrides the idle do not switch page
-            override_idle = message.data.get("__idle")
-            if override_idle is True:
-                # Disable idle screen
-                self.log.debug("Cancelling Idle screen")
-                self.cancel_idle_event()
-                self.resting_screen.override(message)
-            elif isinstance(override_idle, int) and override_idle is not False:
-                self.log.info(
-                    "Overriding idle timer to" " {} seconds".format(override_idle)
-                )
-                self.resting_screen.override(None)
-                self.start_idle_event(override_idle)
-            elif message.data["page"] and not message.data["page"][0].endswith(
-                "idle.qml"
-            ):
-                # Check if the idle override has been set and if this call of
-                # show_page should deactivate a previous idle override
-                # This is only possible if the page is from the same skill
-                self.log.info("Cancelling idle override")
-                if (
-                    self.resting_screen.override_idle is not None
-                    and override_idle is False
-                    and compare_origin(message, self.resting_screen.override_idle[0])
-                ):
-                    # Remove the idle override page if override is set to false
-                    self.resting_screen.cancel_override()
-                # Set default idle screen timer
-                self.start_idle_event(30)
+        """Follow pages shown by other skills, see initialize for filtering."""
+        # Some skill other than the handler is showing a page
+        self.has_show_page = True
+
+        # If a skill overrides the animations do not show any
+        override_animations = message.data.get("__animations", False)
+        if override_animations:
+            # Disable animations
+            self.log.debug("Disabling all animations for page")
+            self.override_animations = True
+        else:
+            self.log.debug("Displaying all animations for page")
+            self.override_animations = False
+
+        # If a skill overrides the idle do not switch page
+        override_idle = message.data.get("__idle")
+        if override_idle is True:
+            # Disable idle screen
+            self.log.debug("Cancelling Idle screen")
+            self.cancel_idle_event()
+            self.resting_screen.override(message)
+        elif isinstance(override_idle, int) and override_idle is not False:
+            self.log.info(
+                "Overriding idle timer to" " {} seconds".format(override_idle)
+            )
+            self.start_idle_event(override_idle)
+        elif message.data["page"] and not message.data["page"][0].endswith("idle.qml"):
+            # Check if the idle override has been set and if this call of
+            # show_page should deactivate a previous idle override
+            # This is only possible if the page is from the same skill
+            self.log.info("Cancelling idle override")
+            if override_idle is False:
+                # Remove the idle override page if override is set to false
+                self.resting_screen.cancel_override(message.data.get("__from"))
+            # Set default idle screen timer
+            self.start_idle_event(30)
 
     def on_handler_mouth_reset(self, _):
-        """Restore viseme to a smile."""
-        pass
+        """Restore viseme to a smile unless speech is still playing."""
+        if not self.speaking.active:
+            self.visemes.stop()
 
     def on_handler_complete(self, message):
         """When a skill finishes executing clear the showing page state."""
-        handler = message.data.get("handler", "")
-        # Ignoring handlers from this skill and from the background clock
-        if "Mark2" in handler:
-            return
-        if "TimeSkill.update_display" in handler:
-            return
-
         self.has_show_page = False
+        self.busy.complete(message.data.get("handler", ""))
 
-        try:
-            if self.hourglass_info[handler] == -1:
-                self.enclosure.reset()
-            del self.hourglass_info[handler]
-        except Exception:
-            # There is a slim chance the self.hourglass_info might not
-            # be populated if this skill reloads at just the right time
-            # so that it misses the mycroft.skill.handler.start but
-            # catches the mycroft.skill.handler.complete
-            pass
+    #####################################################################
+    # Manage all.qml pages
+
+    def _is_page_shown(self):
+        """Check if a page of this skill is on screen."""
+        displayed = self.resting_screen.displayed
+        return displayed is not None and displayed[0] == self.skill_id
+
+    def prewarm_pages(self, pages):
+        """Keep pages of all.qml instantiated so they show without delay.
+
+        The pages are loaded in the background as soon as all.qml is
+        displayed and stay loaded when other states are shown.
+
+        Arguments:
+            pages (iterable): states such as "speaking" or "thinking"
+        """
+        preload = list(self.gui["preloadPages"] if "preloadPages" in self.gui else [])
+        preload.extend(page for page in pages if page not in preload)
+        self.gui["preloadPages"] = preload
 
     #####################################################################
     # Manage "speaking" visual
@@ -402,46 +717,98 @@ class Mark2(MycroftSkill):
         """Show the speaking page if no skill has registered a page
         to be shown in it's place.
         """
-        self.gui["viseme"] = message.data
+        self.visemes.start(message.data)
+        self.speaking.on_visemes(message.data)
         if not self.has_show_page:
-            self.gui["state"] = "speaking"
-            self.gui.show_page("all.qml")
-            # Show idle screen after the visemes are done (+ 2 sec).
-            viseme_time = message.data["visemes"][-1][1] + 5
-            self.start_idle_event(viseme_time)
+            # The end of the speech decides when the idle screen shows
+            self.cancel_idle_event()
+            with GuiUpdate(self.gui, "all.qml") as gui:
+                gui["state"] = "speaking"
+            self.showing_speaking = True
+            self.showing_thinking = False
+
+    def on_speaking_end(self):
+        """Leave the speaking page once the last TTS chunk finished."""
+        self.visemes.stop()
+        if self.showing_speaking:
+            self.showing_speaking = False
+            # Pages shown meanwhile keep their own, later, idle time
+            self.start_idle_event(0)
 
     #####################################################################
     # Manage resting screen visual state
     def cancel_idle_event(self):
         """Cancel the event monitoring current system idle time."""
-        self.resting_screen.next = 0
-        self.cancel_scheduled_event("IdleCheck")
+        with self.resting_screen.lock:
+            self.resting_screen.next = 0
+            self.scheduler.cancel("IdleCheck")
 
     def start_idle_event(self, offset=60, weak=False):
         """Start an event for showing the idle screen.
 
+        Re-arming replaces any pending check on the skill's own scheduler,
+        so this never blocks the calling bus handler.
+
         Arguments:
             offset: How long until the idle screen should be shown
             weak: set to true if the time should be able to be overridden
         """
         with self.resting_screen.lock:
-            if time.monotonic() + offset < self.resting_screen.next:
-                self.log.info("No update, before next time")
+            now = time.monotonic()
+            if now + offset < self.resting_screen.next:
+                self.log.debug("No update, before next time")
                 return
 
-            self.log.debug("Starting idle event")
-            try:
-                if not weak:
-                    self.resting_screen.next = time.monotonic() + offset
-                # Clear any existing checker
-                self.cancel_scheduled_event("IdleCheck")
-                time.sleep(0.5)
-                self.schedule_event(
-                    self.resting_screen.show, int(offset), name="IdleCheck"
-                )
-                self.log.debug("Showing idle screen in " "{} seconds".format(offset))
-            except Exception as e:
-                self.log.exception(repr(e))
+            if not weak:
+                self.resting_screen.next = now + offset
+            self.scheduler.schedule("IdleCheck", offset, self.resting_screen.show)
+        self.log.debug("Showing idle screen in {} seconds".format(offset))
+
+    #####################################################################
+    # Handler metrics
+
+    def _enable_metrics(self):
+        """Measure the busiest handlers, must run before they are registered."""
+        self.metrics = HandlerMetrics()
+        for name in MEASURED_HANDLERS:
+            setattr(self, name, self.metrics.wrap(name, getattr(self, name)))
+        self.resting_screen.show = self.metrics.wrap(
+            "resting_screen.show", self.resting_screen.show
+        )
+        self.resting_screen.lock = self.metrics.wrap_lock(
+            "RestingScreen.lock", self.resting_screen.lock
+        )
+        self.scheduler.schedule(
+            "MetricsDump", METRICS_DUMP_INTERVAL, self._dump_metrics
+        )
+
+    def _metrics_snapshot(self):
+        snapshot = {
+            "enabled": self.metrics is not None,
+            "suppressed_redraws": self.resting_screen.suppressed_redraws,
+        }
+        if self.dispatcher is not None:
+            snapshot["messages"] = self.dispatcher.stats()
+        if self.busy is not None:
+            snapshot["handler_durations"] = self.busy.snapshot()
+        if self.metrics is not None:
+            snapshot.update(self.metrics.snapshot())
+        return snapshot
+
+    def _dump_metrics(self):
+        """Periodically write the metrics to the IPC directory."""
+        path = os.path.join(get_ipc_directory(), "mark2", "metrics.json")
+        try:
+            self.metrics.dump(path, self._metrics_snapshot())
+        except OSError:
+            self.log.exception("Failed to write metrics")
+        self.scheduler.schedule(
+            "MetricsDump", METRICS_DUMP_INTERVAL, self._dump_metrics
+        )
+
+    def handle_metrics_query(self, message):
+        """Answer a mycroft.mark2.metrics query with the current metrics."""
+        self.bus.emit(message.response(self._metrics_snapshot()))
 
     #####################################################################
     # Manage network
@@ -454,20 +821,33 @@ class Mark2(MycroftSkill):
     # Web settings
 
     def on_websettings_changed(self):
-        """Update use of wake-up beep."""
-        self._sync_wake_beep_setting()
-
-    def _sync_wake_beep_setting(self):
-        """Update "use beep" global config from skill settings."""
-        config = Configuration.get()
-        use_beep = self.settings.get("use_listening_beep", False)
-        if not config["confirm_listening"] == use_beep:
-            # Update local (user) configuration setting
-            new_config = {"confirm_listening": use_beep}
-            user_config = LocalConf(USER_CONFIG)
-            user_config.merge(new_config)
-            user_config.store()
-            self.bus.emit(Message("configuration.updated"))
+        """Apply settings changed on the web to the device."""
+        self._sync_config_settings()
+        self._sync_auto_brightness_setting()
+
+    def _sync_config_settings(self):
+        """Update global config values mirrored from skill settings."""
+        for setting, config_key in CONFIG_SETTINGS.items():
+            if setting in self.settings:
+                self.config_writer.set(config_key, self.settings[setting])
+
+    def _sync_auto_brightness_setting(self):
+        """Start or stop auto brightness when it was changed on the web.
+
+        The brightness intents only change the setting on the device, the
+        web keeps its own value and sends it with every settings sync. The
+        last value received is kept so auto brightness only follows the web
+        when the user changed it there.
+        """
+        web_value = self.settings.get("auto_brightness", False)
+        if web_value != self.settings.get("auto_brightness_web", False):
+            self.settings["auto_brightness_web"] = web_value
+            if web_value:
+                self.handle_auto_brightness(None)
+            else:
+                self._stop_auto_brightness()
+        # Keep the state on the device, whichever side changed it last
+        self.settings["auto_brightness"] = bool(self.auto_brightness)
 
     #####################################################################
     # Brightness intent interaction
@@ -491,57 +871,40 @@ class Mark2(MycroftSkill):
             brightness (str): string containing brightness level
 
         Returns:
-            (int): brightness as percentage (0-100)
+            (int): brightness as percentage (0-100), -1 for automatic
+                   brightness or None if the text was not understood
         """
+        result = self.brightness_parser.parse(brightness, self.lang)
+        if result.kind == AUTO:
+            return -1
+        return result.percent
 
-        try:
-            # Handle "full", etc.
-            name = normalize(brightness)
-            if name in self.brightness_dict:
-                return self.brightness_dict[name]
-
-            if "%" in brightness:
-                brightness = brightness.replace("%", "").strip()
-                return int(brightness)
-            if "percent" in brightness:
-                brightness = brightness.replace("percent", "").strip()
-                return int(brightness)
-
-            i = int(brightness)
-            if i < 0 or i > 100:
-                return None
-
-            if i < 30:
-                # Assmume plain 0-30 is "level"
-                return int((i * 100.0) / 30.0)
-
-            # Assume plain 31-100 is "percentage"
-            return i
-        except Exception:
-            return None  # failed in an int() conversion
-
-    def set_screen_brightness(self, level, speak=True):
+    def set_screen_brightness(self, level, speak=True, ramp=None):
         """Actually change screen brightness.
 
         Arguments:
             level (int): 0-30, brightness level
             speak (bool): when True, speak a confirmation
+            ramp (float): seconds to fade to the level, defaults to the
+                          "brightness_ramp" setting
         """
-        # TODO CHANGE THE BRIGHTNESS
+        if ramp is None:
+            ramp = self.settings.get("brightness_ramp", 1)
+        self.brightness.set_level(level, ramp)
         if speak:
             percent = int(float(level) * float(100) / float(30))
             self.speak_dialog("brightness.set", data={"val": str(percent) + "%"})
 
     def _set_brightness(self, brightness):
         # brightness can be a number or word like "full", "half"
-        percent = self.parse_brightness(brightness)
-        if percent is None:
+        result = self.brightness_parser.parse(brightness, self.lang)
+        if result.kind == INVALID:
             self.speak_dialog("brightness.not.found.final")
-        elif int(percent) == -1:
+        elif result.kind == AUTO:
             self.handle_auto_brightness(None)
         else:
-            self.auto_brightness = False
-            self.set_screen_brightness(self.percent_to_level(percent))
+            self._stop_auto_brightness()
+            self.set_screen_brightness(self.percent_to_level(result.percent))
 
     @intent_handler("brightness.intent")
     def handle_brightness(self, message):
@@ -556,80 +919,33 @@ class Mark2(MycroftSkill):
         if brightness:
             self._set_brightness(brightness)
 
-    def _get_auto_time(self):
-        """Get dawn, sunrise, noon, sunset, and dusk time.
-
-        Returns:
-            times (dict): dict with associated (datetime, level)
-        """
-        tz_code = self.location["timezone"]["code"]
-        lat = self.location["coordinate"]["latitude"]
-        lon = self.location["coordinate"]["longitude"]
-        ast_loc = astral.Location()
-        ast_loc.timezone = tz_code
-        ast_loc.lattitude = lat
-        ast_loc.longitude = lon
-
-        user_set_tz = timezone(tz_code).localize(datetime.now()).strftime("%Z")
-        device_tz = time.tzname
-
-        if user_set_tz in device_tz:
-            sunrise = ast_loc.sun()["sunrise"]
-            noon = ast_loc.sun()["noon"]
-            sunset = ast_loc.sun()["sunset"]
-        else:
-            secs = int(self.location["timezone"]["offset"]) / -1000
-            sunrise = (
-                arrow.get(ast_loc.sun()["sunrise"])
-                .shift(seconds=secs)
-                .replace(tzinfo="UTC")
-                .datetime
-            )
-            noon = (
-                arrow.get(ast_loc.sun()["noon"])
-                .shift(seconds=secs)
-                .replace(tzinfo="UTC")
-                .datetime
-            )
-            sunset = (
-                arrow.get(ast_loc.sun()["sunset"])
-                .shift(seconds=secs)
-                .replace(tzinfo="UTC")
-                .datetime
-            )
-
-        return {
-            "Sunrise": (sunrise, 20),  # high
-            "Noon": (noon, 30),  # full
-            "Sunset": (sunset, 5),  # dim
-        }
-
     def schedule_brightness(self, time_of_day, pair):
-        """Schedule auto brightness with the event scheduler.
+        """Schedule auto brightness with the skill's scheduler.
+
+        Long waits are split so a wall clock change, such as the first
+        network time sync after boot, cannot delay the event for hours.
 
         Arguments:
             time_of_day (str): Sunrise, Noon, Sunset
-            pair (tuple): (datetime, brightness)
+            pair (tuple): (datetime, brightness) of the next occurrence
         """
-        d_time = pair[0]
-        brightness = pair[1]
-        now = arrow.now()
-        arw_d_time = arrow.get(d_time)
-        data = (time_of_day, brightness)
-        if now.timestamp > arw_d_time.timestamp:
-            d_time = arrow.get(d_time).shift(hours=+24)
-            self.schedule_event(
-                self._handle_screen_brightness_event,
-                d_time,
-                data=data,
-                name=time_of_day,
+        d_time, brightness = pair
+        delay = (d_time - datetime.now(timezone.utc)).total_seconds()
+        if delay > BRIGHTNESS_RECHECK:
+            self.scheduler.schedule(
+                time_of_day,
+                BRIGHTNESS_RECHECK,
+                self.schedule_brightness,
+                time_of_day,
+                pair,
             )
         else:
-            self.schedule_event(
+            self.scheduler.schedule(
+                time_of_day,
+                delay,
                 self._handle_screen_brightness_event,
-                d_time,
-                data=data,
-                name=time_of_day,
+                time_of_day,
+                brightness,
             )
 
     @intent_handler("brightness.auto.intent")
@@ -640,79 +956,77 @@ class Mark2(MycroftSkill):
             message (Message): messagebus message from intent parser
         """
         self.auto_brightness = True
-        auto_time = self._get_auto_time()
-        nearest_time_to_now = (float("inf"), None, None)
-        for time_of_day, pair in auto_time.items():
-            self.schedule_brightness(time_of_day, pair)
-            now = arrow.now().timestamp
-            timestamp = arrow.get(pair[0]).timestamp
-            if abs(now - timestamp) < nearest_time_to_now[0]:
-                nearest_time_to_now = (abs(now - timestamp), pair[1], time_of_day)
-        self.set_screen_brightness(nearest_time_to_now[1], speak=False)
+        self.settings["auto_brightness"] = True
+        for d_time, time_of_day, level in self.solar_schedule.timeline(self.location):
+            self.schedule_brightness(time_of_day, (d_time, level))
+
+        now = datetime.now(timezone.utc)
+        today = self.solar_schedule.day(self.location).values()
+        _, level = min(today, key=lambda pair: abs(pair[0] - now))
+        self.set_screen_brightness(level, speak=False)
 
-    def _handle_screen_brightness_event(self, message):
-        """Wrapper for setting screen brightness from eventscheduler
+    def _handle_screen_brightness_event(self, time_of_day, level):
+        """Wrapper for setting screen brightness from the scheduler
 
         Arguments:
-            message (Message): messagebus message
+            time_of_day (str): Sunrise, Noon, Sunset
+            level (int): 0-30, brightness level
         """
         if self.auto_brightness:
-            time_of_day = message.data[0]
-            level = message.data[1]
-            self.cancel_scheduled_event(time_of_day)
-            self.set_screen_brightness(level, speak=False)
-            pair = self._get_auto_time()[time_of_day]
+            ramp = self.settings.get("auto_brightness_ramp", 60)
+            self.set_screen_brightness(level, speak=False, ramp=ramp)
+            pair = self.solar_schedule.next_event(self.location, time_of_day)
             self.schedule_brightness(time_of_day, pair)
 
+    def _stop_auto_brightness(self):
+        """Stop changing the brightness with the time of day."""
+        self.auto_brightness = False
+        self.settings["auto_brightness"] = False
+        for time_of_day, _, _ in BRIGHTNESS_EVENTS:
+            self.scheduler.cancel(time_of_day)
+
     #####################################################################
     # Device Settings
 
     @intent_handler("device.settings.intent")
     def handle_device_settings(self, _):
         """Display device settings page."""
-        self.gui["state"] = "settings/settingspage"
-        self.gui.show_page("all.qml")
+        with GuiUpdate(self.gui, "all.qml") as gui:
+            gui["state"] = "settings/settingspage"
 
     @intent_handler("device.homescreen.settings.intent")
     def handle_device_homescreen_settings(self, _):
         """
         display homescreen settings page
         """
-        screens = [
-            {"screenName": s, "screenID": self.resting_screen.screens[s]}
-            for s in self.resting_screen.screens
-        ]
-        self.gui["idleScreenList"] = {"screenBlob": screens}
-        self.gui["selectedScreen"] = self.gui["selected"]
-        self.gui["state"] = "settings/homescreen_settings"
-        self.gui.show_page("all.qml")
+        screens = self.resting_screen.screens.screen_list()
+        with GuiUpdate(self.gui, "all.qml") as gui:
+            gui["idleScreenList"] = {"screenBlob": screens}
+            gui["selectedScreen"] = self.gui["selected"]
+            gui["state"] = "settings/homescreen_settings"
 
     @intent_handler("device.reset.settings.intent")
     def handle_device_factory_reset_settings(self, _):
         """Display device factory reset settings page."""
-        self.gui["state"] = "settings/factoryreset_settings"
-        self.gui.show_page("all.qml")
+        with GuiUpdate(self.gui, "all.qml") as gui:
+            gui["state"] = "settings/factoryreset_settings"
 
     def handle_device_update_settings(self, _):
         """Display device update settings page."""
-        self.gui["state"] = "settings/updatedevice_settings"
-        self.gui.show_page("all.qml")
+        with GuiUpdate(self.gui, "all.qml") as gui:
+            gui["state"] = "settings/updatedevice_settings"
 
     @intent_handler("device.settings.about.page.intent")
     def show_device_settings_about(self, _):
-        """Display device update settings page."""
-        self.gui["mycroftCoreVersion"] = get_mycroft_core_version()
-        self.gui["mycroftCoreCommit"] = get_mycroft_core_commit()
-        self.gui["mycroftContainerBuildDate"] = get_mycroft_build_datetime()
-        skills_repo_path = f"{self.config_core['data_dir']}/.skills-repo"
-        self.gui["mycroftSkillsUpdateDate"] = get_skill_update_datetime(
-            skills_repo_path
-        )
-        self.gui["deviceName"] = get_device_name()
-        self.gui["mycroftUUID"] = get_mycroft_uuid()
-        self.gui["pantacorDeviceId"] = get_pantacor_device_id()
-        self.gui["state"] = "settings/about"
-        self.gui.show_page("all.qml")
+        """Display device about page from the cached device info."""
+        with GuiUpdate(self.gui, "all.qml") as gui:
+            gui.update(self.device_info.get())
+            gui["state"] = "settings/about"
+
+    def _update_device_info(self, changed):
+        """Push device info refreshed in the background to the GUI."""
+        with GuiUpdate(self.gui) as gui:
+            gui.update(changed)
 
 
 def create_skill():
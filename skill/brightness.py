@@ -0,0 +1,236 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import re
+import time
+from collections import namedtuple
+from functools import lru_cache
+from glob import glob
+from pathlib import Path
+from threading import Lock
+
+from mycroft.util.log import LOG
+
+MAX_LEVEL = 30  # Brightness levels used by the skill are 0-30
+BACKLIGHT_GLOB = "/sys/class/backlight/*"
+
+# Kinds of parsed brightness phrases
+PERCENT = "percent"
+LEVEL = "level"
+AUTO = "auto"
+INVALID = "invalid"
+BrightnessResult = namedtuple("BrightnessResult", ["kind", "percent"])
+
+PERCENT_WORDS = (
+    "%",
+    "percent",
+    "prozent",
+    "por ciento",
+    "por cento",
+    "pourcent",
+    "pour cent",
+    "percento",
+    "per cento",
+    "procent",
+    "ehuneko",
+)
+_PERCENT_WORDS_PATTERN = "|".join(re.escape(word) for word in PERCENT_WORDS)
+NUMBER_PATTERN = re.compile(
+    r"^(?:(?P<before>{words})\s*)?"
+    r"(?P<number>\d{{1,3}})"
+    r"\s*(?P<after>{words})?$".format(words=_PERCENT_WORDS_PATTERN)
+)
+
+
+class FileBrightnessSink:
+    """Write brightness levels to a file, such as a sysfs backlight.
+
+    Arguments:
+        path (str): file receiving the brightness value
+        max_value (int): value written for the maximum brightness level
+    """
+
+    def __init__(self, path, max_value=MAX_LEVEL):
+        self.path = Path(path)
+        self.max_value = max_value
+
+    def write(self, level):
+        value = round(level * self.max_value / MAX_LEVEL)
+        self.path.write_text(str(value))
+
+
+class LogBrightnessSink:
+    """Sink for devices without a known backlight, only logs the level."""
+
+    def write(self, level):
+        LOG.info("Brightness level {} (no backlight device)".format(level))
+
+
+def find_brightness_sink():
+    """Get a sink for the first sysfs backlight, or a logging sink."""
+    for backlight in sorted(glob(BACKLIGHT_GLOB)):
+        try:
+            max_value = int(Path(backlight, "max_brightness").read_text())
+        except (OSError, ValueError):
+            continue
+        return FileBrightnessSink(Path(backlight, "brightness"), max_value)
+    return LogBrightnessSink()
+
+
+class BrightnessController:
+    """Ramp the screen brightness towards a target level.
+
+    Requests arriving during a ramp only retarget it, and the sink is
+    written at most once per min_interval and only when the level changes.
+
+    Arguments:
+        sink: object with a write(level) method taking a level from 0-30
+        scheduler (DeadlineScheduler): scheduler driving the ramp steps
+        min_interval (float): minimum seconds between two sink writes
+    """
+
+    def __init__(self, sink, scheduler, min_interval=0.1):
+        self.sink = sink
+        self.scheduler = scheduler
+        self.min_interval = min_interval
+        self.level = None  # Last level written to the sink
+        self._lock = Lock()
+        self._ramp = None  # (start level, target level, start time, duration)
+        self._last_write = 0
+
+    def set_level(self, level, ramp=0):
+        """Move to a brightness level.
+
+        Arguments:
+            level (int): target brightness level 0-30
+            ramp (float): seconds to spend moving to the level
+        """
+        level = min(max(int(level), 0), MAX_LEVEL)
+        with self._lock:
+            start = level if self.level is None else self._current_level()
+            self._ramp = (start, level, time.monotonic(), max(ramp, 0))
+        self._step()
+
+    def _current_level(self):
+        if self._ramp is None:
+            return self.level
+        start, target, started, duration = self._ramp
+        if duration == 0:
+            return target
+        progress = min((time.monotonic() - started) / duration, 1)
+        return start + (target - start) * progress
+
+    def _step(self):
+        with self._lock:
+            if self._ramp is None:
+                return
+            now = time.monotonic()
+            wait = self._last_write + self.min_interval - now
+            if wait <= 0:
+                level = round(self._current_level())
+                target = self._ramp[1]
+                if level == target:
+                    self._ramp = None
+                if level != self.level:
+                    self._write(level)
+                    self._last_write = now
+                wait = self.min_interval
+            if self._ramp is None:
+                return
+        self.scheduler.schedule("BrightnessRamp", wait, self._step)
+
+    def _write(self, level):
+        try:
+            self.sink.write(level)
+            self.level = level
+        except Exception:
+            LOG.exception("Failed to set brightness level {}".format(level))
+
+
+class BrightnessParser:
+    """Parse spoken brightness values for every supported language.
+
+    Level names ("full", "half", ...) are read from the brightness.levels
+    value files of all locales. Results are cached since the same few
+    phrases make up most requests.
+
+    Arguments:
+        locale_dir (str): path of the skill's locale directory
+        cache_size (int): number of parsed phrases to remember
+    """
+
+    def __init__(self, locale_dir, cache_size=256):
+        self.levels = {}  # lang -> {level name: percent}
+        for path in sorted(Path(locale_dir).glob("*/brightness.levels.value")):
+            self.levels[path.parent.name] = self._load_levels(path)
+        self.all_levels = {}
+        for levels in self.levels.values():
+            for name, percent in levels.items():
+                self.all_levels.setdefault(name, percent)
+        self.parse = lru_cache(maxsize=cache_size)(self._parse)
+
+    @staticmethod
+    def _load_levels(path):
+        levels = {}
+        with open(path, encoding="utf-8") as value_file:
+            for line in value_file:
+                if line.startswith("#") or "," not in line:
+                    continue
+                name, _, percent = line.partition(",")
+                try:
+                    levels[name.strip().lower()] = int(percent)
+                except ValueError:
+                    LOG.warning("Bad brightness level in {}: {}".format(path, line))
+        return levels
+
+    def _lookup(self, name, lang):
+        percent = self.levels.get(lang, {}).get(name)
+        if percent is None:
+            percent = self.all_levels.get(name)
+        return percent
+
+    def _parse(self, text, lang):
+        """Parse a brightness phrase.
+
+        Arguments:
+            text (str): brightness phrase, e.g. "half", "50%" or "12"
+            lang (str): language of the phrase
+
+        Returns:
+            BrightnessResult: kind of value and brightness percentage
+        """
+        from mycroft.util.parse import normalize
+
+        text = text.strip().lower()
+        normalized = normalize(text, lang).strip().lower()
+        for name in (normalized, text):
+            percent = self._lookup(name, lang)
+            if percent is not None:
+                if percent < 0:
+                    return BrightnessResult(AUTO, None)
+                return BrightnessResult(PERCENT, percent)
+
+        match = NUMBER_PATTERN.match(normalized) or NUMBER_PATTERN.match(text)
+        if match is None:
+            return BrightnessResult(INVALID, None)
+        number = int(match.group("number"))
+        if number > 100:
+            return BrightnessResult(INVALID, None)
+        if match.group("before") or match.group("after"):
+            return BrightnessResult(PERCENT, number)
+        if number < 30:
+            # Assume plain 0-30 is "level"
+            return BrightnessResult(LEVEL, int((number * 100.0) / 30.0))
+        # Assume plain 31-100 is "percentage"
+        return BrightnessResult(PERCENT, number)
@@ -0,0 +1,140 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from collections import OrderedDict, deque
+from threading import Lock
+
+from mycroft.util.log import LOG
+
+from .metrics import LatencyHistogram
+
+BUSY_DELAY = 1.0  # Seconds a handler runs before the busy visual is shown
+STALE_AFTER = 300  # Seconds after which a handler start without end is dropped
+
+
+class BusyTracker:
+    """Pair skill handler starts and completions to detect slow handlers.
+
+    Running handlers are kept in start order, so the oldest one, which
+    decides when the busy visual is due, is found in constant time. Each
+    handler name keeps a queue of its own running starts, completions are
+    paired with the oldest start of the same handler.
+
+    Arguments:
+        scheduler (DeadlineScheduler): scheduler timing the busy onset
+        on_busy (callable): called when a handler ran longer than the delay
+        on_idle (callable): called when the last running handler completed
+            after on_busy was called
+        delay (float): seconds a handler runs before on_busy is called
+    """
+
+    def __init__(self, scheduler, on_busy, on_idle, delay=BUSY_DELAY):
+        self.scheduler = scheduler
+        self.on_busy = on_busy
+        self.on_idle = on_idle
+        self.delay = delay
+        self.busy = False
+        self.durations = {}  # handler -> LatencyHistogram
+        self._running = OrderedDict()  # sequence -> (handler, start time)
+        self._by_handler = {}  # handler -> deque of sequences
+        self._sequence = 0
+        self._lock = Lock()
+
+    @property
+    def in_flight(self):
+        """Number of handlers currently running."""
+        return len(self._running)
+
+    def start(self, handler):
+        """A skill handler started running."""
+        with self._lock:
+            self._sequence += 1
+            self._running[self._sequence] = (handler, time.monotonic())
+            self._by_handler.setdefault(handler, deque()).append(self._sequence)
+            if len(self._running) == 1:
+                self.scheduler.schedule("BusyOnset", self.delay, self._onset)
+
+    def complete(self, handler):
+        """A skill handler completed, returns its duration in seconds.
+
+        Returns None if its start was not seen, for instance when this
+        skill was reloaded while the handler was running.
+        """
+        with self._lock:
+            sequences = self._by_handler.get(handler)
+            if not sequences:
+                return None
+            sequence = sequences.popleft()
+            if not sequences:
+                del self._by_handler[handler]
+            _, started = self._running.pop(sequence)
+            duration = time.monotonic() - started
+            histogram = self.durations.get(handler)
+            if histogram is None:
+                histogram = self.durations[handler] = LatencyHistogram()
+            histogram.record(duration)
+            idle = self._rearm()
+        if idle:
+            self.on_idle()
+        return duration
+
+    def _rearm(self):
+        """Re-arm the busy onset for the oldest running handler.
+
+        Must be called with the lock held. Returns True if the busy
+        visual should be removed.
+        """
+        now = time.monotonic()
+        while self._running:
+            sequence, (handler, started) = next(iter(self._running.items()))
+            if now - started < STALE_AFTER:
+                break
+            LOG.warning("No completion received for {}".format(handler))
+            del self._running[sequence]
+            sequences = self._by_handler[handler]
+            sequences.popleft()
+            if not sequences:
+                del self._by_handler[handler]
+
+        if not self._running:
+            self.scheduler.cancel("BusyOnset")
+            idle, self.busy = self.busy, False
+            return idle
+        # While busy, check again when the oldest handler becomes stale
+        due = started + (STALE_AFTER if self.busy else self.delay)
+        self.scheduler.schedule("BusyOnset", due - now, self._onset)
+        return False
+
+    def _onset(self):
+        busy = False
+        with self._lock:
+            idle = self._rearm()
+            if not self.busy and self._running:
+                _, started = next(iter(self._running.values()))
+                if time.monotonic() - started >= self.delay:
+                    self.busy = busy = True
+                    self._rearm()
+        if idle:
+            self.on_idle()
+        elif busy:
+            self.on_busy()
+
+    def snapshot(self):
+        """Get the handler durations as a JSON serializable dict."""
+        with self._lock:
+            return {
+                handler: histogram.as_dict()
+                for handler, histogram in self.durations.items()
+            }
@@ -0,0 +1,98 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+from tempfile import NamedTemporaryFile
+from threading import Lock
+
+from mycroft.configuration.config import LocalConf, USER_CONFIG, Configuration
+from mycroft.messagebus.message import Message
+from mycroft.util.log import LOG
+
+# Skill settings mirrored to the user configuration: setting -> config key
+CONFIG_SETTINGS = {
+    "use_listening_beep": "confirm_listening",
+}
+WRITE_DELAY = 1  # Seconds to wait for more changes before writing
+
+
+class ConfigWriter:
+    """Write user configuration changes in batches.
+
+    Changes are collected for a short delay and written from the scheduler
+    thread. Values already in effect are skipped, the file is replaced
+    atomically and a single configuration.updated is emitted per batch.
+
+    Arguments:
+        bus: messagebus client
+        scheduler (DeadlineScheduler): scheduler running the writes
+        path (str): user configuration file
+        delay (float): seconds to wait for more changes before writing
+    """
+
+    def __init__(self, bus, scheduler, path=USER_CONFIG, delay=WRITE_DELAY):
+        self.bus = bus
+        self.scheduler = scheduler
+        self.path = path
+        self.delay = delay
+        self._pending = {}
+        self._lock = Lock()
+
+    def set(self, key, value):
+        """Queue a change of a top level configuration key."""
+        with self._lock:
+            self._pending[key] = value
+        self.scheduler.schedule("ConfigWrite", self.delay, self.flush)
+
+    def flush(self):
+        """Write the queued changes now."""
+        self.scheduler.cancel("ConfigWrite")
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+
+        user_config = LocalConf(self.path)
+        config = Configuration.get()
+        changes = {
+            key: value
+            for key, value in pending.items()
+            if user_config.get(key, config.get(key)) != value
+        }
+        if not changes:
+            return
+
+        user_config.merge(changes)
+        try:
+            self._store(user_config)
+        except OSError:
+            LOG.exception("Failed to write {}".format(self.path))
+            return
+        LOG.info("Updated user configuration: {}".format(", ".join(changes)))
+        self.bus.emit(Message("configuration.updated"))
+
+    def _store(self, user_config):
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        with NamedTemporaryFile(
+            "w", dir=directory, prefix=".mycroft.conf.", delete=False
+        ) as temp_file:
+            json.dump(user_config, temp_file, indent=2)
+        try:
+            mode = os.stat(self.path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o644
+        os.chmod(temp_file.name, mode)
+        os.replace(temp_file.name, self.path)
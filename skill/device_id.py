@@ -12,12 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from mycroft.api import DeviceApi
 from mycroft.identity import IdentityManager
 from mycroft.util import LOG
 
 
 def get_device_name():
+    # The API client is only needed here, import it on first use
+    from mycroft.api import DeviceApi
+
     try:
         return DeviceApi().get()["name"]
     except Exception as err:
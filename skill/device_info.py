@@ -0,0 +1,153 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import time
+from functools import partial
+from threading import Lock, Thread
+
+from mycroft import MYCROFT_ROOT_PATH
+from mycroft.util.log import LOG
+
+from .device_id import get_device_name, get_mycroft_uuid, get_pantacor_device_id
+from .versions import (
+    BUILD_INFO_PATH,
+    get_mycroft_build_datetime,
+    get_mycroft_core_commit,
+    get_mycroft_core_version,
+    get_skill_update_datetime,
+)
+
+DEVICE_NAME_TTL = 3600  # Seconds before the device name is fetched again
+DEVICE_NAME_RETRY = 60  # Seconds before retrying a failed device name fetch
+
+
+def git_state_paths(repo_path):
+    """Files whose modification times change when a repository moves."""
+    git_dir = os.path.join(repo_path, ".git")
+    return (
+        os.path.join(git_dir, "HEAD"),
+        os.path.join(git_dir, "packed-refs"),
+        os.path.join(git_dir, "logs", "HEAD"),
+    )
+
+
+def _signature(paths):
+    """Get the modification times of a set of files, None for missing files."""
+    signature = []
+    for path in paths:
+        try:
+            signature.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
+class DeviceInfoCache:
+    """Cached values for the About page.
+
+    Values are computed in a background thread and only recomputed when the
+    files they are derived from change. The device name comes from the
+    backend and is refreshed after a TTL, the stale value is served until
+    the refresh succeeds.
+
+    Arguments:
+        skills_repo_path (str): path of the Skills Marketplace repository
+        on_change (callable): called with the changed values after a refresh
+        name_ttl (int): seconds before the device name is fetched again
+    """
+
+    def __init__(self, skills_repo_path, on_change=None, name_ttl=DEVICE_NAME_TTL):
+        self.on_change = on_change
+        self.name_ttl = name_ttl
+        self._sources = {
+            "mycroftCoreVersion": ((), get_mycroft_core_version),
+            "mycroftCoreCommit": (
+                git_state_paths(MYCROFT_ROOT_PATH),
+                get_mycroft_core_commit,
+            ),
+            "mycroftContainerBuildDate": (
+                (BUILD_INFO_PATH,),
+                get_mycroft_build_datetime,
+            ),
+            "mycroftSkillsUpdateDate": (
+                git_state_paths(skills_repo_path),
+                partial(get_skill_update_datetime, skills_repo_path),
+            ),
+            "pantacorDeviceId": ((), get_pantacor_device_id),
+        }
+        self._values = {key: "" for key in self._sources}
+        self._values["deviceName"] = ""
+        self._signatures = {}
+        self._name_expires = 0
+        self._refresh_lock = Lock()
+
+    def get(self):
+        """Get the cached values and revalidate them in the background.
+
+        Returns:
+            dict: GUI session keys and their values
+        """
+        values = dict(self._values)
+        values["mycroftUUID"] = get_mycroft_uuid()
+        self.refresh_async()
+        return values
+
+    def refresh_async(self):
+        """Start a background refresh unless one is already running."""
+        if self._refresh_lock.locked():
+            return
+        Thread(target=self.refresh, daemon=True).start()
+
+    def refresh(self):
+        """Recompute the values whose sources changed."""
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            changed = {}
+            for key, (paths, compute) in self._sources.items():
+                signature = _signature(paths)
+                if self._signatures.get(key) == signature:
+                    continue
+                try:
+                    value = compute()
+                except Exception:
+                    LOG.exception("Failed to get {}".format(key))
+                    continue
+                self._signatures[key] = signature
+                if value != self._values[key]:
+                    changed[key] = value
+            changed.update(self._refresh_device_name())
+            self._values.update(changed)
+        finally:
+            self._refresh_lock.release()
+
+        if changed and self.on_change is not None:
+            self.on_change(changed)
+
+    def _refresh_device_name(self):
+        now = time.monotonic()
+        if now < self._name_expires:
+            return {}
+        name = get_device_name()
+        if name == ":error:" and self._values["deviceName"]:
+            # Keep serving the stale name while the backend is unreachable
+            self._name_expires = now + DEVICE_NAME_RETRY
+            return {}
+        self._name_expires = now + (
+            self.name_ttl if name != ":error:" else DEVICE_NAME_RETRY
+        )
+        if name == self._values["deviceName"]:
+            return {}
+        return {"deviceName": name}
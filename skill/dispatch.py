@@ -0,0 +1,127 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import namedtuple
+
+from mycroft.util.log import LOG
+
+Route = namedtuple("Route", ["handler", "ignored_origins", "ignored_handlers"])
+
+
+class TopicCounter:
+    """Message counts of a single topic."""
+
+    __slots__ = ("received", "dropped", "failed")
+
+    def __init__(self):
+        self.received = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def as_dict(self):
+        return {
+            "received": self.received,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+
+class MessageDispatcher:
+    """Single entry point for the skill's high frequency bus messages.
+
+    Each topic is registered once on the bus. Observers see every message
+    of a topic. Messages from ignored origins or about ignored skill
+    handlers are then dropped with set lookups before the handler is called.
+
+    Arguments:
+        bus: messagebus client
+    """
+
+    def __init__(self, bus):
+        self.bus = bus
+        self.routes = {}
+        self.observers = {}
+        self.counters = {}
+
+    def add(self, topic, handler, ignored_origins=(), ignored_handlers=()):
+        """Route a topic to a handler.
+
+        Arguments:
+            topic (str): message type
+            handler (callable): called with the message
+            ignored_origins (iterable): skill ids ("__from") to drop
+            ignored_handlers (iterable): skill handlers to drop, either
+                "Class.method" names or bare skill class names
+        """
+        self._register(topic)
+        self.routes[topic] = Route(
+            handler, frozenset(ignored_origins), frozenset(ignored_handlers)
+        )
+
+    def observe(self, topic, observer):
+        """Call an observer with every message of a topic, before filtering."""
+        self._register(topic)
+        self.observers.setdefault(topic, []).append(observer)
+
+    def _register(self, topic):
+        if topic not in self.counters:
+            self.counters[topic] = TopicCounter()
+            self.bus.on(topic, self.dispatch)
+
+    def dispatch(self, message):
+        """Filter a message and pass it to the handler of its topic."""
+        counter = self.counters.get(message.msg_type)
+        if counter is None:
+            return
+        counter.received += 1
+        for observer in self.observers.get(message.msg_type, ()):
+            try:
+                observer(message)
+            except Exception:
+                counter.failed += 1
+                LOG.exception("Failed to observe {}".format(message.msg_type))
+
+        route = self.routes.get(message.msg_type)
+        if route is None:
+            return
+
+        data = message.data
+        if route.ignored_origins and data.get("__from") in route.ignored_origins:
+            counter.dropped += 1
+            return
+        if route.ignored_handlers:
+            handler_name = data.get("handler", "")
+            if (
+                handler_name in route.ignored_handlers
+                or handler_name.partition(".")[0] in route.ignored_handlers
+            ):
+                counter.dropped += 1
+                return
+
+        try:
+            route.handler(message)
+        except Exception:
+            counter.failed += 1
+            LOG.exception("Failed to handle {}".format(message.msg_type))
+
+    def stats(self):
+        """Get the message counts of every topic."""
+        return {topic: counter.as_dict() for topic, counter in self.counters.items()}
+
+    def shutdown(self):
+        """Remove every route from the bus."""
+        for topic in self.counters:
+            self.bus.remove(topic, self.dispatch)
+        self.routes = {}
+        self.observers = {}
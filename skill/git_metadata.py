@@ -0,0 +1,266 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Read repository metadata straight from the files in a .git directory.
+
+Only what the About page needs is supported: resolving HEAD through loose
+and packed refs, and reading commit objects from loose objects or packs.
+Callers should fall back to the git executable on any GitMetadataError.
+"""
+
+import mmap
+import os
+import struct
+import zlib
+from glob import glob
+
+PACK_IDX_MAGIC = b"\377tOc"
+OBJ_OFS_DELTA = 6
+OBJ_REF_DELTA = 7
+OBJECT_TYPES = {1: "commit", 2: "tree", 3: "blob", 4: "tag"}
+ZLIB_OVERHEAD = 64  # Bytes of zlib header and trailer, with a margin
+
+
+class GitMetadataError(Exception):
+    """The repository could not be read without the git executable."""
+
+
+def find_git_dir(repo_path):
+    """Find the git directory of a work tree, following .git files."""
+    git_path = os.path.join(repo_path, ".git")
+    if os.path.isfile(git_path):
+        with open(git_path) as git_file:
+            content = git_file.read().strip()
+        if not content.startswith("gitdir:"):
+            raise GitMetadataError("Unsupported .git file in " + repo_path)
+        git_path = os.path.join(repo_path, content[len("gitdir:") :].strip())
+    if not os.path.isdir(git_path):
+        raise GitMetadataError("No git directory in " + repo_path)
+    return git_path
+
+
+def _common_dir(git_dir):
+    """Get the directory holding refs and objects shared by worktrees."""
+    common_path = os.path.join(git_dir, "commondir")
+    if os.path.isfile(common_path):
+        with open(common_path) as common_file:
+            return os.path.join(git_dir, common_file.read().strip())
+    return git_dir
+
+
+def _read_packed_refs(common_dir):
+    refs = {}
+    try:
+        with open(os.path.join(common_dir, "packed-refs")) as packed_file:
+            for line in packed_file:
+                if line.startswith(("#", "^")):
+                    continue
+                sha, _, ref = line.strip().partition(" ")
+                refs[ref] = sha
+    except FileNotFoundError:
+        pass
+    return refs
+
+
+def resolve_ref(git_dir, ref):
+    """Resolve a (possibly symbolic) ref to a commit hash."""
+    common_dir = _common_dir(git_dir)
+    for _ in range(10):  # Guard against symbolic ref loops
+        base_dir = git_dir if ref == "HEAD" else common_dir
+        try:
+            with open(os.path.join(base_dir, ref)) as ref_file:
+                content = ref_file.read().strip()
+        except FileNotFoundError:
+            content = _read_packed_refs(common_dir).get(ref)
+            if content is None:
+                raise GitMetadataError("Unknown ref " + ref)
+        if not content.startswith("ref:"):
+            return content
+        ref = content[len("ref:") :].strip()
+    raise GitMetadataError("Too many levels of symbolic refs")
+
+
+def read_head(git_dir):
+    """Get the current branch and commit hash.
+
+    Returns:
+        tuple: (branch name or None if detached, commit hash)
+    """
+    with open(os.path.join(git_dir, "HEAD")) as head_file:
+        head = head_file.read().strip()
+    branch = None
+    if head.startswith("ref:"):
+        branch = head[len("ref:") :].strip()
+        if branch.startswith("refs/heads/"):
+            branch = branch[len("refs/heads/") :]
+    return branch, resolve_ref(git_dir, "HEAD")
+
+
+def _map_file(path):
+    """Map a file in memory read only, pages are only read when accessed."""
+    with open(path, "rb") as mapped_file:
+        try:
+            return mmap.mmap(mapped_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise GitMetadataError("Empty file " + path)
+
+
+def _find_in_pack_index(idx_path, binary_sha):
+    """Get the pack offset of an object from a version 2 pack index."""
+    with _map_file(idx_path) as idx:
+        return _search_pack_index(idx, idx_path, binary_sha)
+
+
+def _search_pack_index(idx, idx_path, binary_sha):
+    if idx[:4] != PACK_IDX_MAGIC or struct.unpack(">I", idx[4:8])[0] != 2:
+        raise GitMetadataError("Unsupported pack index " + idx_path)
+    fanout_start = 8
+    first_byte = binary_sha[0]
+    low = 0
+    if first_byte > 0:
+        low = struct.unpack_from(">I", idx, fanout_start + 4 * (first_byte - 1))[0]
+    high = struct.unpack_from(">I", idx, fanout_start + 4 * first_byte)[0]
+    count = struct.unpack_from(">I", idx, fanout_start + 4 * 255)[0]
+    shas_start = fanout_start + 4 * 256
+    while low < high:
+        middle = (low + high) // 2
+        entry = idx[shas_start + 20 * middle : shas_start + 20 * (middle + 1)]
+        if entry < binary_sha:
+            low = middle + 1
+        elif entry > binary_sha:
+            high = middle
+        else:
+            offsets_start = shas_start + 24 * count  # Skip shas and CRCs
+            offset = struct.unpack_from(">I", idx, offsets_start + 4 * middle)[0]
+            if offset & 0x80000000:
+                large_start = offsets_start + 4 * count
+                large_index = offset & 0x7FFFFFFF
+                offset = struct.unpack_from(">Q", idx, large_start + 8 * large_index)[0]
+            return offset
+    return None
+
+
+def _decompress(data, start, size):
+    # Only read as much compressed data as a zlib stream of size bytes can
+    # take, not the rest of the pack. Stored deflate blocks add 5 bytes per
+    # 64 KiB at worst.
+    end = start + size + 5 * (size // 0xFFFF + 1) + ZLIB_OVERHEAD
+    decompressor = zlib.decompressobj()
+    result = decompressor.decompress(data[start:end], size)
+    if len(result) != size:
+        raise GitMetadataError("Truncated pack entry")
+    return result
+
+
+def _read_varint(data, position):
+    result = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        result |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return result, position
+
+
+def _apply_delta(base, delta):
+    _, position = _read_varint(delta, 0)  # Base size
+    _, position = _read_varint(delta, position)  # Result size
+    result = bytearray()
+    while position < len(delta):
+        opcode = delta[position]
+        position += 1
+        if opcode & 0x80:
+            offset = size = 0
+            for bit in range(4):
+                if opcode & (1 << bit):
+                    offset |= delta[position] << (8 * bit)
+                    position += 1
+            for bit in range(3):
+                if opcode & (1 << (4 + bit)):
+                    size |= delta[position] << (8 * bit)
+                    position += 1
+            result += base[offset : offset + (size or 0x10000)]
+        elif opcode:
+            result += delta[position : position + opcode]
+            position += opcode
+        else:
+            raise GitMetadataError("Invalid delta opcode")
+    return bytes(result)
+
+
+def _read_pack_entry(git_dir, pack, offset):
+    entry_start = offset
+    byte = pack[offset]
+    obj_type = (byte >> 4) & 0x07
+    size = byte & 0x0F
+    shift = 4
+    offset += 1
+    while byte & 0x80:
+        byte = pack[offset]
+        offset += 1
+        size |= (byte & 0x7F) << shift
+        shift += 7
+
+    if obj_type == OBJ_OFS_DELTA:
+        byte = pack[offset]
+        offset += 1
+        base_distance = byte & 0x7F
+        while byte & 0x80:
+            byte = pack[offset]
+            offset += 1
+            base_distance = ((base_distance + 1) << 7) | (byte & 0x7F)
+        base_type, base = _read_pack_entry(git_dir, pack, entry_start - base_distance)
+        return base_type, _apply_delta(base, _decompress(pack, offset, size))
+    if obj_type == OBJ_REF_DELTA:
+        base_type, base = read_object(git_dir, pack[offset : offset + 20].hex())
+        return base_type, _apply_delta(base, _decompress(pack, offset + 20, size))
+    if obj_type not in OBJECT_TYPES:
+        raise GitMetadataError("Unknown pack object type {}".format(obj_type))
+    return OBJECT_TYPES[obj_type], _decompress(pack, offset, size)
+
+
+def read_object(git_dir, sha):
+    """Read an object from the loose object store or the packs.
+
+    Returns:
+        tuple: (object type, object content)
+    """
+    objects_dir = os.path.join(_common_dir(git_dir), "objects")
+    loose_path = os.path.join(objects_dir, sha[:2], sha[2:])
+    if os.path.isfile(loose_path):
+        with open(loose_path, "rb") as loose_file:
+            raw = zlib.decompress(loose_file.read())
+        header, _, content = raw.partition(b"\0")
+        return header.split(b" ")[0].decode(), content
+
+    binary_sha = bytes.fromhex(sha)
+    for idx_path in glob(os.path.join(objects_dir, "pack", "*.idx")):
+        offset = _find_in_pack_index(idx_path, binary_sha)
+        if offset is not None:
+            with _map_file(idx_path[: -len(".idx")] + ".pack") as pack:
+                return _read_pack_entry(git_dir, pack, offset)
+    raise GitMetadataError("Object {} not found".format(sha))
+
+
+def read_commit_timestamp(git_dir, sha):
+    """Get the committer timestamp of a commit as seconds since the epoch."""
+    obj_type, content = read_object(git_dir, sha)
+    if obj_type != "commit":
+        raise GitMetadataError("{} is not a commit".format(sha))
+    for line in content.split(b"\n"):
+        if not line:
+            break  # End of the commit headers
+        if line.startswith(b"committer "):
+            return int(line.rsplit(b" ", 2)[1])
+    raise GitMetadataError("Commit {} has no committer".format(sha))
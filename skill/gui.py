@@ -0,0 +1,90 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from mycroft.messagebus.message import Message
+
+
+def _session_data(gui):
+    """Get the session data dict of a SkillGUI without triggering a sync."""
+    # Private attribute of mycroft.enclosure.gui.SkillGUI, checked against
+    # mycroft-core 21.2 (feature/mark-2). Returns None if a later core
+    # renames it, GuiUpdate then falls back to one sync per value.
+    return getattr(gui, "_SkillGUI__session_data", None)
+
+
+class GuiUpdate:
+    """Batch GUI session data changes into a single sync.
+
+    Each SkillGUI assignment sends the session data to the GUI. Inside a
+    GuiUpdate block only values that differ from the current ones are
+    recorded, and they are sent together when the block exits, along with
+    the page to show if one was given.
+
+    Example:
+        with GuiUpdate(self.gui, "all.qml") as gui:
+            gui["state"] = "settings/about"
+            gui["deviceName"] = name
+
+    Arguments:
+        gui (SkillGUI): GUI of the skill
+        page (str): optional page to show once the data is updated
+    """
+
+    def __init__(self, gui, page=None):
+        self.gui = gui
+        self.page = page
+        self.changes = {}
+
+    def __setitem__(self, key, value):
+        if key in self.gui and self.gui[key] == value:
+            self.changes.pop(key, None)
+        else:
+            self.changes[key] = value
+
+    def __getitem__(self, key):
+        if key in self.changes:
+            return self.changes[key]
+        return self.gui[key]
+
+    def update(self, values):
+        """Record several values at once."""
+        for key, value in values.items():
+            self[key] = value
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+        return False
+
+    def flush(self):
+        """Send the recorded changes and show the page."""
+        session_data = _session_data(self.gui)
+        if session_data is None:
+            # Unknown GUI implementation, fall back to one sync per value
+            for key, value in self.changes.items():
+                self.gui[key] = value
+        else:
+            session_data.update(self.changes)
+            if self.page is None and self.changes and self.gui.page is not None:
+                data = dict(self.changes)
+                data["__from"] = self.gui.skill.skill_id
+                self.gui.skill.bus.emit(Message("gui.value.set", data))
+        self.changes = {}
+
+        if self.page is not None:
+            # Showing the page sends the whole session data to the GUI
+            self.gui.show_page(self.page)
@@ -0,0 +1,157 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import time
+from functools import wraps
+from threading import Lock
+
+SUB_BUCKET_BITS = 3  # 8 buckets per power of two, about 12% precision
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+MAX_MICROSECONDS = 1 << 36  # About 19 hours, longer values are clamped
+
+
+def _bucket_index(value):
+    if value < SUB_BUCKETS:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    return (shift + 1) * SUB_BUCKETS + (value >> shift) - SUB_BUCKETS
+
+
+def _bucket_value(index):
+    if index < SUB_BUCKETS:
+        return index
+    shift = index // SUB_BUCKETS - 1
+    return (index % SUB_BUCKETS + SUB_BUCKETS) << shift
+
+
+class LatencyHistogram:
+    """Fixed memory histogram of durations with log-linear buckets."""
+
+    def __init__(self):
+        self.counts = [0] * (_bucket_index(MAX_MICROSECONDS) + 1)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, seconds):
+        microseconds = min(max(int(seconds * 1000000), 0), MAX_MICROSECONDS)
+        self.counts[_bucket_index(microseconds)] += 1
+        self.count += 1
+        self.total += microseconds
+        self.max = max(self.max, microseconds)
+
+    def percentile(self, percent):
+        """Get the lower bound of the bucket holding a percentile, in ms."""
+        if self.count == 0:
+            return 0
+        threshold = self.count * percent / 100
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= threshold:
+                return _bucket_value(index) / 1000
+        return self.max / 1000
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count / 1000 if self.count else 0,
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max / 1000,
+        }
+
+
+class TimedLock:
+    """Lock wrapper recording how long callers wait to acquire it."""
+
+    def __init__(self, lock, histogram):
+        self.lock = lock
+        self.histogram = histogram
+
+    def acquire(self, *args, **kwargs):
+        start = time.monotonic()
+        acquired = self.lock.acquire(*args, **kwargs)
+        self.histogram.record(time.monotonic() - start)
+        return acquired
+
+    def release(self):
+        self.lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *_):
+        self.release()
+
+
+class HandlerMetrics:
+    """Call counts and latency histograms of the skill's handlers.
+
+    Nothing is measured unless handlers are wrapped, so the skill only
+    wraps them when metrics are enabled.
+    """
+
+    def __init__(self):
+        self.handlers = {}
+        self.locks = {}
+        self._lock = Lock()
+
+    def wrap(self, name, handler):
+        """Wrap a handler to record its latency under a name."""
+        histogram = self.handlers.setdefault(name, LatencyHistogram())
+
+        @wraps(handler)
+        def timed_handler(*args, **kwargs):
+            start = time.monotonic()
+            try:
+                return handler(*args, **kwargs)
+            finally:
+                elapsed = time.monotonic() - start
+                with self._lock:
+                    histogram.record(elapsed)
+
+        return timed_handler
+
+    def wrap_lock(self, name, lock):
+        """Wrap a lock to record the time spent waiting for it."""
+        return TimedLock(lock, self.locks.setdefault(name, LatencyHistogram()))
+
+    def snapshot(self):
+        """Get the current metrics as a JSON serializable dict."""
+        with self._lock:
+            return {
+                "handlers": {
+                    name: histogram.as_dict()
+                    for name, histogram in self.handlers.items()
+                },
+                "lock_wait": {
+                    name: histogram.as_dict() for name, histogram in self.locks.items()
+                },
+            }
+
+    def dump(self, path, extra=None):
+        """Write a snapshot to a file, replacing it atomically."""
+        snapshot = self.snapshot()
+        snapshot.update(extra or {})
+        snapshot["time"] = time.time()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + ".tmp"
+        with open(temp_path, "w") as metrics_file:
+            json.dump(snapshot, metrics_file)
+        os.replace(temp_path, path)
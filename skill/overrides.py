@@ -0,0 +1,103 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import heapq
+import time
+from collections import namedtuple
+
+IdleOverride = namedtuple("IdleOverride", ["origin", "message", "priority", "expires"])
+
+
+class IdleOverrideStack:
+    """Resting screen overrides of several skills, one per origin skill.
+
+    The active override is the one with the highest priority, the most
+    recent one among equal priorities. Overrides may expire, expired and
+    replaced entries are dropped lazily from the heap.
+    """
+
+    def __init__(self):
+        self._overrides = {}  # origin -> (sequence, IdleOverride)
+        self._heap = []  # (-priority, -sequence, origin)
+        self._sequence = 0
+
+    def push(self, origin, message, priority=0, timeout=None):
+        """Add or replace the override of a skill.
+
+        Arguments:
+            origin (str): id of the skill overriding the resting screen
+            message (Message): gui.page.show message restoring its page
+            priority (int): overrides with higher priorities win
+            timeout (float): seconds until the override expires, None to
+                             keep it until it is removed
+        """
+        expires = None if timeout is None else time.monotonic() + timeout
+        self._sequence += 1
+        self._overrides[origin] = (
+            self._sequence,
+            IdleOverride(origin, message, priority, expires),
+        )
+        heapq.heappush(self._heap, (-priority, -self._sequence, origin))
+        if len(self._heap) > 2 * len(self._overrides) + 16:
+            self._heap = [
+                (-override.priority, -sequence, origin)
+                for origin, (sequence, override) in self._overrides.items()
+            ]
+            heapq.heapify(self._heap)
+
+    def remove(self, origin):
+        """Remove the override of a skill.
+
+        Returns:
+            bool: True if the removed override was the active one
+        """
+        active = self.top()
+        self._overrides.pop(origin, None)
+        return active is not None and active.origin == origin
+
+    def pop(self):
+        """Remove and return the active override, None if there is none."""
+        active = self.top()
+        if active is not None:
+            self._overrides.pop(active.origin)
+        return active
+
+    def top(self):
+        """Get the active override, None if there is none."""
+        now = time.monotonic()
+        while self._heap:
+            _, negative_sequence, origin = self._heap[0]
+            sequence, override = self._overrides.get(origin, (None, None))
+            if sequence != -negative_sequence:
+                heapq.heappop(self._heap)  # Removed or replaced since
+            elif override.expires is not None and override.expires <= now:
+                heapq.heappop(self._heap)
+                del self._overrides[origin]
+            else:
+                return override
+        return None
+
+    def next_expiry(self):
+        """Seconds until the active override expires, None if it does not."""
+        active = self.top()
+        if active is None or active.expires is None:
+            return None
+        return max(active.expires - time.monotonic(), 0)
+
+    def clear(self):
+        self._overrides.clear()
+        self._heap.clear()
+
+    def __contains__(self, origin):
+        return origin in self._overrides
@@ -0,0 +1,84 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import subprocess
+import time
+from threading import Thread
+
+from mycroft.util.log import LOG
+
+SYSTEMCTL = "/usr/bin/systemctl"
+SHUTDOWN_DEADLINE = 5  # Seconds the preparation may take before powering off
+
+
+class ShutdownCoordinator:
+    """Prepare the device for a reboot or power off, then run it.
+
+    The announcement and the preparation steps, such as flushing settings,
+    run in parallel. The system command runs once they are all done or the
+    deadline expired, whichever comes first.
+
+    Arguments:
+        steps (dict): preparation callables by name
+        runner (callable): runs the system command given as an argument list
+        deadline (float): seconds to wait for the announcement and steps
+    """
+
+    def __init__(self, steps, runner=subprocess.call, deadline=SHUTDOWN_DEADLINE):
+        self.steps = steps
+        self.runner = runner
+        self.deadline = deadline
+
+    def run(self, action, announce=None):
+        """Prepare and run a systemctl action.
+
+        Arguments:
+            action (str): "reboot" or "poweroff"
+            announce (callable): speaks the announcement, returns once it
+                                 was played
+
+        Returns:
+            the result of the runner
+        """
+        start = time.monotonic()
+        tasks = dict(self.steps)
+        if announce is not None:
+            tasks["announcement"] = announce
+        threads = {
+            name: Thread(
+                target=self._run_task, args=(name, task), name=name, daemon=True
+            )
+            for name, task in tasks.items()
+        }
+        for thread in threads.values():
+            thread.start()
+        end = start + self.deadline
+        for name, thread in threads.items():
+            thread.join(max(end - time.monotonic(), 0))
+            if thread.is_alive():
+                LOG.warning("{} not done before {}".format(name, action))
+
+        LOG.info(
+            "Running {} {:.0f} ms after the request".format(
+                action, (time.monotonic() - start) * 1000
+            )
+        )
+        return self.runner([SYSTEMCTL, action])
+
+    @staticmethod
+    def _run_task(name, task):
+        try:
+            task()
+        except Exception:
+            LOG.exception("Failed to prepare shutdown: {}".format(name))
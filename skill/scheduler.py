@@ -0,0 +1,129 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import heapq
+import time
+from threading import Condition, Thread
+
+from mycroft.util.log import LOG
+
+
+class DeadlineScheduler:
+    """In-process scheduler for named deadlines owned by the skill.
+
+    A single daemon thread sleeps until the earliest deadline. Re-arming a
+    name replaces its previous deadline without waking the thread unless the
+    new deadline is the earliest one, so bursts of re-arms are coalesced into
+    a single wakeup.
+    """
+
+    def __init__(self, name="Mark2Scheduler"):
+        self.name = name
+        self._entries = {}  # name -> (deadline, sequence, callback, args)
+        self._heap = []  # (deadline, sequence, name), may hold stale entries
+        self._sequence = 0
+        self._condition = Condition()
+        self._thread = None
+        self._running = True
+
+    def schedule(self, name, delay, callback, *args):
+        """Arm (or re-arm) a named deadline.
+
+        Arguments:
+            name (str): deadline name, replaces any earlier one with that name
+            delay (float): seconds from now until the callback runs
+            callback (callable): function to call when the deadline expires
+            args: positional arguments for the callback
+        """
+        deadline = time.monotonic() + max(0, delay)
+        with self._condition:
+            self._sequence += 1
+            self._entries[name] = (deadline, self._sequence, callback, args)
+            earliest = self._heap[0][0] if self._heap else None
+            heapq.heappush(self._heap, (deadline, self._sequence, name))
+            self._compact()
+            self._ensure_thread()
+            if earliest is None or deadline < earliest:
+                self._condition.notify()
+
+    def cancel(self, name):
+        """Cancel a named deadline if it is armed."""
+        with self._condition:
+            self._entries.pop(name, None)
+
+    def remaining(self, name):
+        """Seconds until the named deadline expires, None if not armed."""
+        with self._condition:
+            entry = self._entries.get(name)
+        if entry is None:
+            return None
+        return max(0, entry[0] - time.monotonic())
+
+    def shutdown(self):
+        """Stop the scheduler thread and drop all deadlines."""
+        with self._condition:
+            self._running = False
+            self._entries.clear()
+            self._heap.clear()
+            self._condition.notify()
+
+    def _compact(self):
+        """Drop stale heap entries once they outnumber the live ones."""
+        if len(self._heap) > 2 * len(self._entries) + 16:
+            self._heap = [
+                (deadline, sequence, name)
+                for name, (deadline, sequence, _, _) in self._entries.items()
+            ]
+            heapq.heapify(self._heap)
+
+    def _ensure_thread(self):
+        if self._thread is None:
+            self._thread = Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def _next_due(self):
+        """Wait for and pop the next live expired entry.
+
+        Must be called with the condition held. Returns None on shutdown.
+        """
+        while self._running:
+            if not self._heap:
+                self._condition.wait()
+                continue
+            deadline, sequence, name = self._heap[0]
+            entry = self._entries.get(name)
+            if entry is None or entry[1] != sequence:
+                # Entry was cancelled or re-armed since it was pushed
+                heapq.heappop(self._heap)
+                continue
+            timeout = deadline - time.monotonic()
+            if timeout > 0:
+                self._condition.wait(timeout)
+                continue
+            heapq.heappop(self._heap)
+            del self._entries[name]
+            return name, entry
+        return None
+
+    def _run(self):
+        while True:
+            with self._condition:
+                due = self._next_due()
+            if due is None:
+                return
+            name, (_, _, callback, args) = due
+            try:
+                callback(*args)
+            except Exception:
+                LOG.exception("Scheduled callback {} failed".format(name))
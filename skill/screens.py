@@ -0,0 +1,153 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import time
+from collections import OrderedDict, namedtuple
+
+from mycroft.util.log import LOG
+
+MAX_SCREENS = 32
+SNAPSHOT_VERSION = 1
+ScreenEntry = namedtuple("ScreenEntry", ["screen_id", "owner", "registered"])
+
+
+class ScreenRegistry:
+    """Resting screens registered by Skills, by display name.
+
+    The registry is bounded, the least recently registered screen is
+    evicted when it is full. The version is bumped on every change and the
+    list sent to the homescreen settings page is cached per version.
+
+    Arguments:
+        max_screens (int): maximum number of registered screens
+    """
+
+    def __init__(self, max_screens=MAX_SCREENS):
+        self.max_screens = max_screens
+        self.version = 0
+        self._entries = OrderedDict()
+        self._screen_list = None
+        self._screen_list_version = None
+
+    def register(self, name, screen_id, owner=None, registered=None):
+        """Register a resting screen.
+
+        Arguments:
+            name (str): display name of the screen
+            screen_id (str): id used to emit "<id>.idle", the Skill id
+            owner (str): Skill owning the screen, defaults to the screen id
+            registered (float): registration time, defaults to now
+
+        Returns:
+            bool: True if the registry changed
+        """
+        owner = owner or screen_id
+        previous = self._entries.pop(name, None)
+        self._entries[name] = ScreenEntry(screen_id, owner, registered or time.time())
+        if previous is not None and previous[:2] == (screen_id, owner):
+            return False
+        while len(self._entries) > self.max_screens:
+            evicted, _ = self._entries.popitem(last=False)
+            LOG.warning("Too many resting screens, dropped {}".format(evicted))
+        self.version += 1
+        return True
+
+    def remove(self, name):
+        """Remove a screen by name, returns True if it was registered."""
+        if self._entries.pop(name, None) is None:
+            return False
+        self.version += 1
+        return True
+
+    def remove_owner(self, owner):
+        """Remove the screens of a Skill.
+
+        Returns:
+            list: names of the removed screens
+        """
+        names = [name for name, entry in self._entries.items() if entry.owner == owner]
+        for name in names:
+            self.remove(name)
+        return names
+
+    def entries(self):
+        """Get a copy of the (name, ScreenEntry) pairs."""
+        return list(self._entries.items())
+
+    def get(self, name, default=None):
+        """Get the screen id of a screen name."""
+        entry = self._entries.get(name)
+        return default if entry is None else entry.screen_id
+
+    def screen_list(self):
+        """List the screens for the homescreen settings page."""
+        if self._screen_list_version != self.version:
+            self._screen_list = [
+                {"screenName": name, "screenID": entry.screen_id}
+                for name, entry in self._entries.items()
+            ]
+            self._screen_list_version = self.version
+        return self._screen_list
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def __iter__(self):
+        return iter(list(self._entries))
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def save_snapshot(path, registry, last_shown=None):
+    """Write the registered screens to a file, replacing it atomically.
+
+    Arguments:
+        path (str): snapshot file
+        registry (ScreenRegistry): screens to store
+        last_shown (str): name of the last idle screen shown
+    """
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "screens": [[name] + list(entry) for name, entry in registry.entries()],
+        "last_shown": last_shown,
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as snapshot_file:
+        json.dump(snapshot, snapshot_file)
+    os.replace(temp_path, path)
+
+
+def load_snapshot(path):
+    """Read screens written by save_snapshot.
+
+    Returns:
+        tuple: ([(name, ScreenEntry)], last shown name), nothing if the file
+               is missing, unreadable or from another version
+    """
+    try:
+        with open(path) as snapshot_file:
+            snapshot = json.load(snapshot_file)
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            return [], None
+        entries = [(name, ScreenEntry(*entry)) for name, *entry in snapshot["screens"]]
+    except FileNotFoundError:
+        return [], None
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        LOG.warning("Ignoring invalid resting screen snapshot {}".format(path))
+        return [], None
+    return entries, snapshot.get("last_shown")
@@ -0,0 +1,123 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+
+# Auto brightness events: (event name, astral key, brightness level 0-30)
+BRIGHTNESS_EVENTS = (
+    ("Sunrise", "sunrise", 20),  # high
+    ("Noon", "noon", 30),  # full
+    ("Sunset", "sunset", 5),  # dim
+)
+MAX_CACHED_DAYS = 4
+
+
+class SolarSchedule:
+    """Daily sunrise, noon and sunset times for auto brightness.
+
+    The times of a day are computed with a single astral call and cached by
+    (date, latitude, longitude, timezone) so the events of a day are only
+    computed once.
+    """
+
+    def __init__(self):
+        self._days = OrderedDict()
+
+    def day(self, location, day=None):
+        """Get the auto brightness events of a day.
+
+        Arguments:
+            location (dict): Mycroft location configuration
+            day (date): day to get the events for, defaults to today
+
+        Returns:
+            dict: event name -> (datetime, brightness level)
+        """
+        day = day or date.today()
+        tz_code = location["timezone"]["code"]
+        lat = location["coordinate"]["latitude"]
+        lon = location["coordinate"]["longitude"]
+        key = (day, lat, lon, tz_code)
+        if key not in self._days:
+            self._days[key] = self._compute_day(location, day)
+            while len(self._days) > MAX_CACHED_DAYS:
+                self._days.popitem(last=False)
+        return self._days[key]
+
+    def timeline(self, location, count=3, now=None):
+        """Get the next auto brightness transitions in chronological order.
+
+        Arguments:
+            location (dict): Mycroft location configuration
+            count (int): number of transitions to return
+            now (datetime): timezone aware reference time, defaults to now
+
+        Returns:
+            list: (datetime, event name, brightness level) tuples
+        """
+        now = now or datetime.now(timezone.utc)
+        transitions = []
+        day = now.date() - timedelta(days=1)  # Covers timezones behind UTC
+        for _ in range(count // len(BRIGHTNESS_EVENTS) + 3):
+            events = self.day(location, day)
+            transitions.extend(
+                (when, name, level)
+                for name, (when, level) in events.items()
+                if when > now
+            )
+            day += timedelta(days=1)
+        return sorted(transitions)[:count]
+
+    def next_event(self, location, name, now=None):
+        """Get the next occurrence of a named event.
+
+        Returns:
+            tuple: (datetime, brightness level)
+        """
+        for when, event_name, level in self.timeline(
+            location, len(BRIGHTNESS_EVENTS), now
+        ):
+            if event_name == name:
+                return when, level
+        raise ValueError("Unknown brightness event " + name)
+
+    @staticmethod
+    def _compute_day(location, day):
+        from pytz import timezone as pytz_timezone
+        import astral
+
+        tz_code = location["timezone"]["code"]
+        ast_loc = astral.Location()
+        ast_loc.timezone = tz_code
+        ast_loc.latitude = location["coordinate"]["latitude"]
+        ast_loc.longitude = location["coordinate"]["longitude"]
+        sun = ast_loc.sun(date=day)
+
+        user_set_tz = pytz_timezone(tz_code).localize(datetime.now()).strftime("%Z")
+        if user_set_tz in time.tzname:
+            shift = None
+        else:
+            # Device clock is not in the user's timezone, present the times
+            # as UTC shifted by the configured offset.
+            shift = timedelta(seconds=int(location["timezone"]["offset"]) / -1000)
+
+        events = {}
+        for name, key, level in BRIGHTNESS_EVENTS:
+            when = sun[key]
+            if shift is not None:
+                when = (when + shift).replace(tzinfo=timezone.utc)
+            events[name] = (when, level)
+        return events
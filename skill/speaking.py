@@ -0,0 +1,98 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from threading import Lock
+
+from mycroft.util.log import LOG
+
+END_GRACE = 0.3  # Seconds to wait for the next chunk after audio ends
+FALLBACK_PADDING = 5  # Seconds after the last viseme if audio end is missed
+
+
+class SpeakingSession:
+    """Follow the audio output of multi chunk TTS sessions.
+
+    The TTS plays an utterance as several chunks, each one emitting its own
+    audio output start and end. The session ends when no new chunk starts
+    within a short grace period after the last one finished. The end of the
+    visemes plus a padding is only used if the audio end is never received.
+
+    Arguments:
+        scheduler (DeadlineScheduler): scheduler timing the session end
+        on_end (callable): called without arguments when the session ends
+        grace (float): seconds to wait for the next chunk
+        padding (float): seconds after the visemes before ending anyway
+    """
+
+    def __init__(self, scheduler, on_end, grace=END_GRACE, padding=FALLBACK_PADDING):
+        self.scheduler = scheduler
+        self.on_end = on_end
+        self.grace = grace
+        self.padding = padding
+        self.active = False
+        self.playing = False
+        self._lock = Lock()
+
+    def on_audio_start(self, _=None):
+        """A chunk started playing."""
+        with self._lock:
+            self.active = True
+            self.playing = True
+            self.scheduler.cancel("SpeakingEnd")
+
+    def on_audio_end(self, _=None):
+        """A chunk finished playing, end the session if no other follows."""
+        with self._lock:
+            self.playing = False
+            if self.active:
+                self.scheduler.schedule("SpeakingEnd", self.grace, self.end, "audio")
+
+    def on_speech_stop(self, _=None):
+        """Speech was stopped, end the session without waiting."""
+        self.end("stop")
+
+    def on_visemes(self, data):
+        """Arm the fallback end from the visemes of a chunk.
+
+        Arguments:
+            data (dict): enclosure.mouth.viseme_list data with the playback
+                         "start" time and the "visemes"
+        """
+        visemes = data.get("visemes") or [[None, 0]]
+        start = data.get("start") or time.time()
+        deadline = start + visemes[-1][1] + self.padding
+        with self._lock:
+            self.active = True
+            self.scheduler.schedule(
+                "SpeakingFallback", deadline - time.time(), self.end, "fallback"
+            )
+
+    def end(self, reason="stop"):
+        """End the session now.
+
+        Arguments:
+            reason (str): what ended the session, for the logs
+        """
+        with self._lock:
+            if reason == "audio" and self.playing:
+                return  # The next chunk started while the grace expired
+            self.scheduler.cancel("SpeakingEnd")
+            self.scheduler.cancel("SpeakingFallback")
+            if not self.active:
+                return
+            self.active = False
+            self.playing = False
+        LOG.debug("Speaking session ended ({})".format(reason))
+        self.on_end()
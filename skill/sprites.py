@@ -0,0 +1,193 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Pre-rendered sprite sheets for the GUI animations.
+
+Evaluating the Lottie animations at runtime is expensive without a GPU,
+so they are rasterized into sprite sheets kept in ui/sprites. Rebuild them
+after changing an animation:
+
+    python -m skill.sprites [--frame-rate 20] [--scale 0.5]
+
+Building requires rlottie-python and Pillow. The skill falls back to the
+Lottie animations when no sprite sheet was built.
+"""
+
+import argparse
+import itertools
+import json
+import math
+from pathlib import Path
+
+UI_DIR = Path(__file__).resolve().parent.parent / "ui"
+SPRITE_DIR = UI_DIR / "sprites"
+SPRITE_VERSION = 1
+# Largest texture side Qt's sprite engine accepts without OpenGL, as on the
+# Mark II where the scene graph renders in software
+MAX_TEXTURE_SIZE = 2048
+# Frame rates and render scales tried, from best to worst, when none is
+# requested. The GUI scales smaller frames back up.
+FRAME_RATES = (30, 25, 20, 15, 12, 10)
+SCALES = (1, 0.75, 0.5)
+BACKGROUND_TOLERANCE = 8  # Color difference still treated as background
+ANIMATIONS = {"thinking": UI_DIR / "thinking.json"}
+
+
+def load_sprite(name, sprite_dir=SPRITE_DIR):
+    """Get the metadata of a built sprite sheet.
+
+    Returns:
+        dict: sprite sheet metadata for the GUI, None if it was not built
+    """
+    try:
+        with open(sprite_dir / (name + ".json")) as metadata_file:
+            metadata = json.load(metadata_file)
+    except (OSError, ValueError):
+        return None
+    if metadata.get("version") != SPRITE_VERSION:
+        return None
+    if not (sprite_dir / metadata["image"]).is_file():
+        return None
+    metadata["source"] = "sprites/" + metadata["image"]
+    return metadata
+
+
+def render_lottie(path, width, height, frame_rate):
+    """Render a Lottie animation to Pillow images at a frame rate."""
+    from rlottie_python import LottieAnimation
+
+    animation = LottieAnimation.from_file(str(path))
+    step = animation.lottie_animation_get_framerate() / frame_rate
+    frame_count = int(animation.lottie_animation_get_totalframe() / step)
+    return [
+        animation.render_pillow_frame(
+            frame_num=int(index * step), width=width, height=height
+        )
+        for index in range(frame_count)
+    ]
+
+
+class SpriteSheetTooLarge(ValueError):
+    """The frames do not fit in a single texture."""
+
+
+def build_sprite_sheet(name, frames, frame_rate, sprite_dir=SPRITE_DIR):
+    """Crop frames to their moving content and pack them in a sprite sheet.
+
+    The background color is taken from the top left pixel of the first
+    frame. The GUI paints it behind the sprite instead of storing it.
+    """
+    from PIL import Image, ImageChops
+
+    width, height = frames[0].size
+    background = frames[0].convert("RGB").getpixel((0, 0))
+    background_image = Image.new("RGB", (width, height), background)
+    boxes = [
+        ImageChops.difference(frame.convert("RGB"), background_image)
+        .convert("L")
+        .point(lambda value: 255 if value > BACKGROUND_TOLERANCE else 0)
+        .getbbox()
+        for frame in frames
+    ]
+    boxes = [box for box in boxes if box] or [(0, 0, width, height)]
+    left = min(box[0] for box in boxes)
+    top = min(box[1] for box in boxes)
+    right = max(box[2] for box in boxes)
+    bottom = max(box[3] for box in boxes)
+    frame_width, frame_height = right - left, bottom - top
+
+    columns = min(MAX_TEXTURE_SIZE // frame_width, len(frames))
+    rows = math.ceil(len(frames) / columns)
+    if rows * frame_height > MAX_TEXTURE_SIZE:
+        raise SpriteSheetTooLarge(
+            "{} frames do not fit in a {} pixel texture, "
+            "lower the frame rate or scale".format(len(frames), MAX_TEXTURE_SIZE)
+        )
+    sheet = Image.new("RGBA", (columns * frame_width, rows * frame_height))
+    for index, frame in enumerate(frames):
+        position = (
+            (index % columns) * frame_width,
+            (index // columns) * frame_height,
+        )
+        sheet.paste(frame.crop((left, top, right, bottom)), position)
+
+    sprite_dir.mkdir(parents=True, exist_ok=True)
+    image_name = name + ".png"
+    sheet.save(sprite_dir / image_name, optimize=True)
+    metadata = {
+        "version": SPRITE_VERSION,
+        "image": image_name,
+        "frameCount": len(frames),
+        "frameRate": frame_rate,
+        "frameWidth": frame_width,
+        "frameHeight": frame_height,
+        # Position of the frames in the original animation
+        "x": left,
+        "y": top,
+        "width": width,
+        "height": height,
+        "background": "#{:02x}{:02x}{:02x}".format(*background),
+    }
+    with open(sprite_dir / (name + ".json"), "w") as metadata_file:
+        json.dump(metadata, metadata_file, indent=2)
+    return metadata
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--frame-rate",
+        type=int,
+        help="frames per second, defaults to the highest rate that fits",
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        help="render scale, defaults to the largest scale that fits",
+    )
+    parser.add_argument("--width", type=int, default=480)
+    parser.add_argument("--height", type=int, default=800)
+    options = parser.parse_args(args)
+    frame_rates = [options.frame_rate] if options.frame_rate else FRAME_RATES
+    scales = [options.scale] if options.scale else SCALES
+    for name, path in ANIMATIONS.items():
+        for scale, frame_rate in itertools.product(scales, frame_rates):
+            width = round(options.width * scale)
+            height = round(options.height * scale)
+            frames = render_lottie(path, width, height, frame_rate)
+            try:
+                metadata = build_sprite_sheet(name, frames, frame_rate)
+                break
+            except SpriteSheetTooLarge as error:
+                print(
+                    "{} at {} fps, {}x{}: {}".format(
+                        name, frame_rate, width, height, error
+                    )
+                )
+        else:
+            raise SystemExit("Could not build a sprite sheet for " + name)
+        print(
+            "{}: {} frames of {}x{} at {} fps, rendered at {}x{}".format(
+                name,
+                metadata["frameCount"],
+                metadata["frameWidth"],
+                metadata["frameHeight"],
+                frame_rate,
+                width,
+                height,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
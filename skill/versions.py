@@ -13,19 +13,28 @@
 # limitations under the License.
 
 import json
+import zlib
 from datetime import datetime
 from pathlib import Path
 
-from git import Git
-
 from mycroft import MYCROFT_ROOT_PATH
+from mycroft.util.log import LOG
 from mycroft.version import CORE_VERSION_STR
 
+from .git_metadata import (
+    GitMetadataError,
+    find_git_dir,
+    read_commit_timestamp,
+    read_head,
+)
+
+BUILD_INFO_PATH = "/etc/mycroft/build-info.json"
+
 
 def get_mycroft_build_datetime():
     """Get the Mycroft container build date from a file, if it exists."""
     build_datetime = ""
-    build_info_path = Path("/etc/mycroft/build-info.json")
+    build_info_path = Path(BUILD_INFO_PATH)
     if build_info_path.is_file():
         with open(build_info_path) as build_info_file:
             build_info = json.loads(build_info_file.read())
@@ -36,17 +45,28 @@ def get_mycroft_build_datetime():
 
 def get_mycroft_core_commit():
     """Get the latest commit info for Mycroft-Core."""
-    commit_string = ""
-    core_repo = Git(MYCROFT_ROOT_PATH)
-    branch = core_repo.branch("--show-current")
+    try:
+        branch, commit_hash = read_head(find_git_dir(MYCROFT_ROOT_PATH))
+    except (GitMetadataError, OSError, ValueError):
+        LOG.info("Falling back to git executable for Mycroft-Core commit")
+        branch, commit_hash = _git_core_head()
     if not branch:
         # It's in a detached head state so is not reporting branch.
         branch = "feature/mark-2"
-    commit_hash = core_repo.log("-n 1", "--pretty=format:%h")[:7]
-    commit_string = f"{branch}@{commit_hash}"
+    commit_string = f"{branch}@{commit_hash[:7]}"
     return commit_string
 
 
+def _git_core_head():
+    """Get the Mycroft-Core branch and commit using the git executable."""
+    from git import Git
+
+    core_repo = Git(MYCROFT_ROOT_PATH)
+    branch = core_repo.branch("--show-current")
+    commit_hash = core_repo.log("-n 1", "--pretty=format:%h")
+    return branch, commit_hash
+
+
 def get_mycroft_core_version():
     """Get the reported version number for Mycroft-Core.
 
@@ -58,7 +78,14 @@ def get_mycroft_core_version():
 
 def get_skill_update_datetime(skills_repo_path):
     """Get the date the Skills Marketplace last updated."""
-    skills_repo = Git(skills_repo_path)
-    last_commit_timestamp = skills_repo.log("-1", "--format=%ct")
+    try:
+        git_dir = find_git_dir(skills_repo_path)
+        last_commit_timestamp = read_commit_timestamp(git_dir, read_head(git_dir)[1])
+    except (GitMetadataError, OSError, ValueError, zlib.error):
+        LOG.info("Falling back to git executable for Skills update date")
+        from git import Git
+
+        skills_repo = Git(skills_repo_path)
+        last_commit_timestamp = skills_repo.log("-1", "--format=%ct")
     last_commit_date_time = datetime.utcfromtimestamp(int(last_commit_timestamp))
     return last_commit_date_time.strftime("%Y-%m-%d %H:%M")
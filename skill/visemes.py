@@ -0,0 +1,106 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from bisect import bisect_right
+
+VISEME_QUANTUM = 10  # Milliseconds, well below the 50 ms GUI tick
+CHUNK_DURATION = 5000  # Milliseconds of visemes pushed to the GUI at a time
+CHUNK_LEAD = 1000  # Milliseconds a chunk is pushed before it is needed
+EMPTY_VISEMES = {"start": 0, "codes": "", "ends": []}
+
+
+def compact_visemes(visemes, quantum=VISEME_QUANTUM):
+    """Compact a viseme list into parallel code and end time arrays.
+
+    Consecutive identical visemes are merged, end times are converted to
+    milliseconds rounded to the quantum and visemes that become empty after
+    rounding are dropped.
+
+    Arguments:
+        visemes (list): [code, end time in seconds] pairs from the TTS
+        quantum (int): resolution of the end times in milliseconds
+
+    Returns:
+        tuple: (codes, end times in milliseconds)
+    """
+    codes = []
+    ends = []
+    for code, end in visemes:
+        code = str(code)
+        end = int(round(end * 1000 / quantum)) * quantum
+        if ends and end <= ends[-1]:
+            continue
+        if codes and codes[-1] == code:
+            ends[-1] = end
+        else:
+            codes.append(code)
+            ends.append(end)
+    if all(len(code) == 1 for code in codes):
+        codes = "".join(codes)
+    return codes, ends
+
+
+class VisemeStreamer:
+    """Push visemes to the GUI in chunks following the playback.
+
+    Arguments:
+        gui (SkillGUI): GUI receiving the "viseme" session data
+        scheduler (DeadlineScheduler): scheduler timing the chunk pushes
+    """
+
+    def __init__(self, gui, scheduler):
+        self.gui = gui
+        self.scheduler = scheduler
+        self.start_time = 0
+        self.codes = ""
+        self.ends = []
+
+    def start(self, data):
+        """Start streaming the visemes of an enclosure.mouth.viseme_list.
+
+        Arguments:
+            data (dict): message data with "start" and "visemes"
+        """
+        self.start_time = data["start"]
+        self.codes, self.ends = compact_visemes(data["visemes"])
+        self._push(0)
+
+    def stop(self):
+        """Stop streaming and clear the visemes shown by the GUI."""
+        self.scheduler.cancel("VisemeChunk")
+        if self.start_time == 0:
+            return  # Nothing shown, avoid a needless GUI sync
+        self.start_time = 0
+        self.codes, self.ends = "", []
+        self.gui["viseme"] = EMPTY_VISEMES
+
+    def _push(self, index):
+        # Chunks overlap by the lead time so the viseme being shown when a
+        # chunk arrives is always part of it.
+        begin = max(index * CHUNK_DURATION - CHUNK_LEAD, 0)
+        end = (index + 1) * CHUNK_DURATION
+        first = bisect_right(self.ends, begin)
+        # Include the viseme spanning the chunk end
+        last = min(bisect_right(self.ends, end) + 1, len(self.ends))
+        self.gui["viseme"] = {
+            "start": self.start_time,
+            "codes": self.codes[first:last],
+            "ends": self.ends[first:last],
+        }
+        if last < len(self.ends):
+            next_push = self.start_time + (end - CHUNK_LEAD) / 1000
+            self.scheduler.schedule(
+                "VisemeChunk", next_push - time.time(), self._push, index + 1
+            )
@@ -0,0 +1,120 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from threading import Lock
+
+from .gui import GuiUpdate, _session_data
+
+# Messages changing the speaker volume to a 0.0 - 1.0 "percent". Replies
+# to volume queries (mycroft.volume.get.response) are not changes.
+VOLUME_EVENTS = ("mycroft.volume.set",)
+FRAME_INTERVAL = 1 / 30  # Seconds, at most one GUI update per frame
+HIDE_DELAY = 2  # Seconds the overlay stays after the last change
+
+
+class VolumeOverlay:
+    """Show speaker volume changes over the current all.qml page.
+
+    Only the pages of this skill show the overlay. Pages of other Skills
+    live in their own GUI namespace, which this skill's session data does
+    not reach, so volume changes made over them, or over the resting
+    screen, only record the level and send nothing to the GUI.
+
+    Changes are coalesced so the GUI receives at most one update per frame
+    interval, with the latest level. The overlay is hidden by a single
+    deadline which is pushed back by each change, instead of scheduling a
+    hide per change.
+
+    Arguments:
+        gui (SkillGUI): GUI receiving the "speakerVolume" session data
+        scheduler (DeadlineScheduler): scheduler timing updates and hiding
+        is_shown (callable): returns True while a page of this skill is on
+                             screen
+        frame_interval (float): minimum seconds between GUI updates
+        hide_delay (float): seconds the overlay stays after the last change
+    """
+
+    def __init__(
+        self,
+        gui,
+        scheduler,
+        is_shown,
+        frame_interval=FRAME_INTERVAL,
+        hide_delay=HIDE_DELAY,
+    ):
+        self.gui = gui
+        self.scheduler = scheduler
+        self.is_shown = is_shown
+        self.frame_interval = frame_interval
+        self.hide_delay = hide_delay
+        self.level = None
+        self.updates = 0
+        self._last_update = 0
+        self._hide_at = 0
+        self._lock = Lock()
+
+    def on_volume(self, message):
+        """Follow a volume message, see VOLUME_EVENTS."""
+        percent = message.data.get("percent")
+        if percent is not None:
+            self.set(int(round(float(percent) * 100)))
+
+    def set(self, level):
+        """Show a volume level.
+
+        Arguments:
+            level (int): speaker volume, 0-100
+        """
+        now = time.monotonic()
+        with self._lock:
+            self.level = min(max(level, 0), 100)
+            if not self.is_shown():
+                return
+            if self._hide_at <= now:
+                self.scheduler.schedule("VolumeHide", self.hide_delay, self._hide)
+            self._hide_at = now + self.hide_delay
+            if self.scheduler.remaining("VolumeFrame") is not None:
+                return  # The pending frame will show the latest level
+            wait = self._last_update + self.frame_interval - now
+            if wait > 0:
+                self.scheduler.schedule("VolumeFrame", wait, self._update)
+                return
+        self._update()
+
+    def _update(self):
+        if not self.is_shown():
+            return  # Left this skill's page while the frame was pending
+        with self._lock:
+            self._last_update = time.monotonic()
+            level = self.level
+            self.updates += 1
+        with GuiUpdate(self.gui) as gui:
+            gui["speakerVolume"] = level
+            gui["volumeOverlay"] = True
+
+    def _hide(self):
+        with self._lock:
+            remaining = self._hide_at - time.monotonic()
+            if remaining > 0:
+                # Changed since the deadline was armed, wait for the new one
+                self.scheduler.schedule("VolumeHide", remaining, self._hide)
+                return
+            self.scheduler.cancel("VolumeFrame")
+        session_data = None if self.is_shown() else _session_data(self.gui)
+        if session_data is None:
+            self.gui["volumeOverlay"] = False
+        else:
+            # Not on screen, the value is sent with the next page show
+            session_data["volumeOverlay"] = False
@@ -0,0 +1,67 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measure brightness phrase parsing over the phrases of every locale.
+
+    python test/benchmarks/bench_brightness.py [--rounds 1000]
+
+The phrases are the level names and "50 percent" like phrases built from
+each locale's brightness.intent. Uncached parses are timed with the phrase
+cache cleared before each round, cached parses repeat the same round.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from skill.brightness import BrightnessParser  # noqa: E402
+from test_brightness import LANGUAGES, LOCALE_DIR, percent_phrases  # noqa: E402
+
+
+def time_rounds(parser, phrases, rounds, clear):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        if clear:
+            parser.parse.cache_clear()
+        for lang, phrase in phrases:
+            parser.parse(phrase, lang)
+    return (time.perf_counter() - start) / (rounds * len(phrases))
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=1000)
+    options = parser.parse_args(args)
+
+    start = time.perf_counter()
+    brightness = BrightnessParser(str(LOCALE_DIR), cache_size=1024)
+    load_time = time.perf_counter() - start
+    phrases = []
+    for lang in LANGUAGES:
+        phrases += [(lang, phrase) for phrase in percent_phrases(lang)]
+        phrases += [(lang, name) for name in brightness.levels[lang]]
+
+    uncached = time_rounds(brightness, phrases, options.rounds, clear=True)
+    cached = time_rounds(brightness, phrases, options.rounds, clear=False)
+    print("{} phrases in {} languages".format(len(phrases), len(LANGUAGES)))
+    print("level files loaded in {:.2f} ms".format(load_time * 1000))
+    print("uncached parse: {:.1f} us per phrase".format(uncached * 1e6))
+    print("cached parse: {:.2f} us per phrase".format(cached * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Count the bus messages the skill sends per minute of busy conversation.
+
+    python test/benchmarks/bench_bus_messages.py [--turns 100]
+
+The skill's deadlines run on its local scheduler, which sends nothing on
+the bus. Through the core event scheduler each re-arm was a
+mycroft.scheduler.remove_event and a mycroft.scheduler.schedule_event
+message, and each expiry a message from the core scheduler back to the
+skill. The report adds those round trips to the measured messages to
+show what the same run costs with the core scheduler.
+"""
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from harness import SkillHarness, conversation_trace  # noqa: E402
+
+MESSAGES_PER_REARM = 2  # remove_event, schedule_event
+MESSAGES_PER_EXPIRY = 1  # Event emitted by the core scheduler
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=100)
+    options = parser.parse_args(args)
+
+    trace = conversation_trace(options.turns)
+    minutes = sum(delay for delay, _, _ in trace) / 60
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with SkillHarness(tmp_dir) as harness:
+            fired_before = harness.scheduler.fired.copy()
+            report = harness.replay(trace)
+            fired = harness.scheduler.fired - fired_before
+
+    sent = sum(report["sent"].values())
+    print("{} turns, {:.1f} minutes".format(options.turns, minutes))
+    print(
+        "{:<20} {:>8} {:>8} {:>12}".format(
+            "deadline", "re-arms", "expired", "core msg/min"
+        )
+    )
+    round_trips = 0
+    for name in sorted(set(report["scheduled"]) | set(fired)):
+        messages = (
+            report["scheduled"].get(name, 0) * MESSAGES_PER_REARM
+            + fired[name] * MESSAGES_PER_EXPIRY
+        )
+        round_trips += messages
+        print(
+            "{:<20} {:>8} {:>8} {:>12.1f}".format(
+                name, report["scheduled"].get(name, 0), fired[name], messages / minutes
+            )
+        )
+    print("local scheduler: {:.1f} messages/min".format(sent / minutes))
+    print("core scheduler: {:.1f} messages/min".format((sent + round_trips) / minutes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Replay a stream of bus messages through the MessageDispatcher.
+
+    python test/benchmarks/bench_dispatch.py [--turns 1000] [--noise 3]
+
+The stream interleaves synthetic conversations with messages the skill
+drops (its own handlers, the clock's display updates and its own pages).
+It is delivered once to handlers subscribed with bus.on doing substring
+checks, as the skill used to, and once through the dispatcher.
+"""
+
+import argparse
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from mycroft.messagebus.message import Message  # noqa: E402
+
+from harness import FakeBus, conversation_trace  # noqa: E402
+from test_dispatch import make_dispatcher, noise_trace  # noqa: E402
+
+
+def substring_handlers(bus, received):
+    """Subscribe handlers filtering like the skill did before the dispatcher."""
+
+    def on_handler_started(message):
+        handler = message.data.get("handler", "")
+        if "Mark2" in handler or "TimeSkill.update_display" in handler:
+            return
+        received.append(message)
+
+    def on_page_show(message):
+        if "mark-2" not in message.data.get("__from", ""):
+            received.append(message)
+
+    bus.on("mycroft.skill.handler.start", on_handler_started)
+    bus.on("gui.page.show", on_page_show)
+    bus.on("enclosure.mouth.viseme_list", received.append)
+    bus.on("gui.page_interaction", received.append)
+
+
+def time_stream(bus, messages):
+    start = time.perf_counter()
+    for message in messages:
+        bus.deliver(message)
+    return time.perf_counter() - start
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=1000)
+    parser.add_argument(
+        "--noise", type=int, default=3, help="dropped message groups per turn"
+    )
+    options = parser.parse_args(args)
+
+    trace = []
+    for turn in conversation_trace(options.turns):
+        trace.append(turn)
+        if turn[1] == "gui.page_interaction":
+            trace += noise_trace(options.noise)
+    messages = [Message(msg_type, dict(data)) for _, msg_type, data in trace]
+
+    baseline_received = []
+    baseline_bus = FakeBus()
+    substring_handlers(baseline_bus, baseline_received)
+    baseline = time_stream(baseline_bus, messages)
+
+    dispatcher_bus = FakeBus()
+    received = Counter()
+    dispatcher = make_dispatcher(dispatcher_bus, received)
+    dispatched = time_stream(dispatcher_bus, messages)
+
+    stats = dispatcher.stats()
+    dropped = sum(counter["dropped"] for counter in stats.values())
+    print("{} messages, {} dropped by the dispatcher".format(len(messages), dropped))
+    assert sum(received.values()) == len(baseline_received)
+    for name, elapsed in (("bus.on handlers", baseline), ("dispatcher", dispatched)):
+        print("{}: {:.2f} us per message".format(name, elapsed / len(messages) * 1e6))
+
+
+if __name__ == "__main__":
+    main()
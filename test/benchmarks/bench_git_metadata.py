@@ -0,0 +1,98 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compare the .git reader with the git executable fallback.
+
+    python test/benchmarks/bench_git_metadata.py [repository] [--runs 50]
+
+Both read the branch, HEAD commit and its committer timestamp, like the
+About page does. The fallback uses GitPython when it is installed.
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from skill.git_metadata import (  # noqa: E402
+    find_git_dir,
+    read_commit_timestamp,
+    read_head,
+)
+
+
+def read_with_reader(repo):
+    git_dir = find_git_dir(repo)
+    branch, sha = read_head(git_dir)
+    return branch, sha, read_commit_timestamp(git_dir, sha)
+
+
+def read_with_git(repo):
+    try:
+        from git import Git
+    except ImportError:
+
+        def run(*args):
+            return subprocess.run(
+                ["git", "-C", repo, *args], check=True, capture_output=True, text=True
+            ).stdout.strip()
+
+    else:
+        git = Git(repo)
+
+        def run(command, *args):
+            return getattr(git, command)(*args)
+
+    branch = run("branch", "--show-current")
+    sha = run("log", "-n 1", "--pretty=format:%H")
+    return branch, sha, int(run("log", "-1", "--format=%ct"))
+
+
+def measure(function, repo, runs):
+    start = time.perf_counter()
+    for _ in range(runs):
+        result = function(repo)
+    elapsed = (time.perf_counter() - start) / runs
+    tracemalloc.start()
+    function(repo)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("repository", nargs="?", default=str(ROOT))
+    parser.add_argument("--runs", type=int, default=50)
+    options = parser.parse_args(args)
+
+    results = {}
+    for name, function in (("reader", read_with_reader), ("git", read_with_git)):
+        result, elapsed, peak = measure(function, options.repository, options.runs)
+        results[name] = result
+        print(
+            "{:6} {:8.2f} ms per lookup, {:8.1f} KiB peak Python allocations".format(
+                name, elapsed * 1000, peak / 1024
+            )
+        )
+    if results["reader"] != results["git"]:
+        raise SystemExit("Results differ: {}".format(results))
+
+
+if __name__ == "__main__":
+    main()
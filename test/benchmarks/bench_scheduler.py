@@ -0,0 +1,91 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measure idle check re-arms on the skill scheduler.
+
+    python test/benchmarks/bench_scheduler.py [--threads 4] [--rate 1000]
+
+Bus handler threads re-arm the idle check at a fixed rate, as bursts of
+page shows do. The time each re-arm blocks its handler is reported; the
+idle check used to sleep for 0.5 s under a lock on every re-arm.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from threading import Thread
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from skill.scheduler import DeadlineScheduler  # noqa: E402
+
+
+def rearm(scheduler, rate, duration, latencies):
+    interval = 1 / rate
+    next_call = time.perf_counter()
+    end = next_call + duration
+    while next_call < end:
+        start = time.perf_counter()
+        scheduler.schedule("IdleCheck", 30, lambda: None)
+        latencies.append(time.perf_counter() - start)
+        next_call += interval
+        time.sleep(max(0, next_call - time.perf_counter()))
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--rate", type=int, default=1000, help="re-arms per second")
+    parser.add_argument("--duration", type=float, default=2)
+    options = parser.parse_args(args)
+
+    scheduler = DeadlineScheduler()
+    latencies = []
+    start = time.perf_counter()
+    threads = [
+        Thread(
+            target=rearm,
+            args=(
+                scheduler,
+                options.rate / options.threads,
+                options.duration,
+                latencies,
+            ),
+        )
+        for _ in range(options.threads)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    scheduler.shutdown()
+
+    latencies.sort()
+    print(
+        "{} re-arms in {:.2f} s ({:.0f}/s)".format(
+            len(latencies), elapsed, len(latencies) / elapsed
+        )
+    )
+    print(
+        "blocking per re-arm: p50 {:.1f} us, p99 {:.1f} us, max {:.1f} us".format(
+            latencies[len(latencies) // 2] * 1e6,
+            latencies[int(len(latencies) * 0.99)] * 1e6,
+            latencies[-1] * 1e6,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
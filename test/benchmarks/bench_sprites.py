@@ -0,0 +1,189 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compare the thinking animations decode and frame times with offscreen Qt.
+
+    python test/benchmarks/bench_sprites.py [--seconds 5]
+
+Decode times: the sprite sheet PNG, every frame of ring_ball.gif and, when
+rlottie-python is installed, every frame of thinking.json at 480x800.
+Frame times: each animation runs in a 480x800 QQuickView on the offscreen
+platform with the software scene graph, as on the GPU-less Mark II, and
+the CPU time per rendered frame and per second is reported. The Lottie scene
+needs the org.kde.lottie QML module and is skipped without it.
+
+Requires PyQt5. Build the sprite sheet first with python -m skill.sprites.
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from skill.sprites import ANIMATIONS, UI_DIR, load_sprite  # noqa: E402
+
+WIDTH, HEIGHT = 480, 800
+
+SPRITE_SCENE = """
+import QtQuick 2.4
+Rectangle {{
+    color: "{background}"
+    AnimatedSprite {{
+        x: {x}; y: {y}; width: {frameWidth}; height: {frameHeight}
+        source: "{path}"
+        frameWidth: {frameWidth}; frameHeight: {frameHeight}
+        frameCount: {frameCount}; frameRate: {frameRate}
+        interpolate: false; loops: AnimatedSprite.Infinite; running: true
+    }}
+}}
+"""
+GIF_SCENE = """
+import QtQuick 2.4
+Rectangle {{
+    color: "black"
+    AnimatedImage {{
+        anchors.centerIn: parent
+        source: "{path}"
+        playing: true
+    }}
+}}
+"""
+LOTTIE_SCENE = """
+import QtQuick 2.4
+import org.kde.lottie 1.0
+Rectangle {{
+    color: "black"
+    LottieAnimation {{
+        anchors.centerIn: parent
+        height: Math.min(parent.width, parent.height)
+        source: "{path}"
+        loops: Animation.Infinite
+        fillMode: Image.PreserveAspectFit
+        running: true
+    }}
+}}
+"""
+
+
+def time_call(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def decode_times(sprite):
+    from PyQt5.QtGui import QImage, QMovie
+
+    times = {}
+    elapsed, image = time_call(
+        lambda: QImage(str(UI_DIR / "sprites" / sprite["image"]))
+    )
+    times["sprite sheet"] = (elapsed, 1 if not image.isNull() else 0)
+
+    def decode_gif():
+        movie = QMovie(str(UI_DIR / "ring_ball.gif"))
+        movie.setCacheMode(QMovie.CacheNone)
+        # The GIF loops, jumpToNextFrame() would restart it forever
+        for _ in range(movie.frameCount()):
+            movie.jumpToNextFrame()
+            movie.currentImage()
+        return movie.frameCount()
+
+    times["ring_ball.gif"] = time_call(decode_gif)
+    try:
+        from skill.sprites import render_lottie
+
+        elapsed, frames = time_call(
+            lambda: render_lottie(ANIMATIONS["thinking"], WIDTH, HEIGHT, 60)
+        )
+        times["thinking.json"] = (elapsed, len(frames))
+    except ImportError:
+        print("rlottie-python is not installed, skipping the Lottie decode")
+    return times
+
+
+def frame_times(app, scene, seconds):
+    """Run a QML scene and get the CPU seconds used and the frame count."""
+    from PyQt5.QtCore import QByteArray, QEventLoop, QTimer, QUrl
+    from PyQt5.QtQml import QQmlComponent
+    from PyQt5.QtQuick import QQuickView
+
+    view = QQuickView()
+    view.resize(WIDTH, HEIGHT)
+    view.setResizeMode(QQuickView.SizeRootObjectToView)
+    frames = []
+    view.frameSwapped.connect(lambda: frames.append(time.perf_counter()))
+    component = QQmlComponent(view.engine())
+    component.setData(QByteArray(scene.encode()), QUrl.fromLocalFile(str(UI_DIR) + "/"))
+    root = component.create()
+    if root is None:
+        view.deleteLater()
+        return None, component.errorString().strip()
+    view.setContent(QUrl(), component, root)
+    view.show()
+
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    cpu_start = time.process_time()
+    loop.exec_()
+    cpu = time.process_time() - cpu_start
+    view.close()
+    view.deleteLater()
+    app.processEvents()
+    if not frames:
+        return None, "no frame rendered"
+    return cpu, len(frames)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5)
+    options = parser.parse_args(args)
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    os.environ.setdefault("QT_QUICK_BACKEND", "software")
+    try:
+        from PyQt5.QtGui import QGuiApplication
+    except ImportError:
+        raise SystemExit("PyQt5 is required")
+    sprite = load_sprite("thinking")
+    if sprite is None:
+        raise SystemExit("No sprite sheet, run python -m skill.sprites first")
+
+    app = QGuiApplication([sys.argv[0]])
+    for name, (elapsed, frames) in decode_times(sprite).items():
+        print("decode {}: {:.1f} ms for {} frames".format(name, elapsed * 1000, frames))
+
+    sprite_values = dict(sprite, path=sprite["source"])
+    scenes = {
+        "sprite sheet": SPRITE_SCENE.format(**sprite_values),
+        "ring_ball.gif": GIF_SCENE.format(path="ring_ball.gif"),
+        "thinking.json": LOTTIE_SCENE.format(path="thinking.json"),
+    }
+    for name, scene in scenes.items():
+        cpu, frames = frame_times(app, scene, options.seconds)
+        if cpu is None:
+            print("frames {}: skipped, {}".format(name, frames))
+        else:
+            print(
+                "frames {}: {:.2f} ms CPU per frame, {:.0%} CPU, {} frames".format(
+                    name, cpu / frames * 1000, cpu / options.seconds, frames
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
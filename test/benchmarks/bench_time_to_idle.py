@@ -0,0 +1,91 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measure the time to the resting screen on cold and warm skill reloads.
+
+    python test/benchmarks/bench_time_to_idle.py [--screens 5] [--spread 1.5]
+
+A cold load starts without a resting screen snapshot, a warm load reuses
+the snapshot written by the previous load. After each start the Skills
+answer the collect request one after the other over --spread seconds,
+the selected homescreen last, within the 2 s collect deadline. Reported:
+the wall clock time of the skill start and the simulated time until the
+resting screen was shown.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from harness import SkillHarness, import_skill  # noqa: E402
+
+HOMESCREEN = ("Mycroft Homescreen", "mycroft-homescreen.mycroftai")
+
+
+def load(tmp_dir, screens, spread):
+    """Start the skill and replay the collect answers.
+
+    Returns:
+        tuple: (start seconds, simulated seconds until the idle screen)
+    """
+    harness = SkillHarness(tmp_dir)
+    start = time.perf_counter()
+    harness.start()
+    start_time = time.perf_counter() - start
+    try:
+        started = harness.clock.now
+        shown_at = None
+        delay = spread / len(screens)
+        for name, screen_id in screens:
+            if shown_at is None and harness.bus.sent_types(HOMESCREEN[1] + ".idle"):
+                shown_at = harness.clock.now
+            harness.advance(delay)
+            harness.inject(
+                "mycroft.mark2.register_idle", {"name": name, "id": screen_id}
+            )
+        if shown_at is None and harness.bus.sent_types(HOMESCREEN[1] + ".idle"):
+            shown_at = harness.clock.now
+    finally:
+        harness.stop()
+    return start_time, None if shown_at is None else shown_at - started
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--screens", type=int, default=5)
+    parser.add_argument("--spread", type=float, default=1.5)
+    options = parser.parse_args(args)
+    screens = [
+        ("Screen {}".format(index), "screen{}.skill".format(index))
+        for index in range(options.screens - 1)
+    ] + [HOMESCREEN]
+
+    import_skill()  # Only time the skill start, not the first import
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name in ("cold", "warm"):
+            start_time, shown = load(tmp_dir, screens, options.spread)
+            print(
+                "{}: skill start {:.1f} ms, resting screen after {}".format(
+                    name,
+                    start_time * 1000,
+                    "never" if shown is None else "{:.2f} s".format(shown),
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Offline tests of the Mark2 skill.
+
+They run in the mycroft-core environment the skill is installed in, plus
+pytest and the skill's requirements.txt:
+
+    python -m pytest test
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+TEST_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(TEST_DIR.parent))  # The skill's own modules: skill.*
+sys.path.insert(0, str(TEST_DIR))  # The harness
+
+from harness import SkillHarness  # noqa: E402
+
+
+@pytest.fixture
+def harness(tmp_path):
+    """A started Mark2 skill, see harness.SkillHarness."""
+    with SkillHarness(tmp_path) as skill_harness:
+        yield skill_harness
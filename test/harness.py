@@ -0,0 +1,350 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Offline harness running the Mark2 skill without a Mark II.
+
+The skill is loaded through create_skill() and started like the skill
+loader does, but bound to a FakeBus and driven by a FakeScheduler on a
+FakeClock. Message traces can then be replayed to measure handler latency,
+the messages sent to the GUI and the deadlines armed by the skill.
+
+Example:
+    with SkillHarness(tmp_dir) as harness:
+        report = harness.replay(conversation_trace())
+"""
+
+import heapq
+import importlib.util
+import sys
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from mycroft.messagebus.message import Message
+
+ROOT = Path(__file__).resolve().parent.parent
+SKILL_ID = "mycroft-mark-2.mycroftai"
+SKILL_MODULE = "mark2_skill"
+GUI_MESSAGES = ("gui.value.set", "gui.page.show", "gui.clear.namespace")
+
+
+def import_skill():
+    """Import the skill package, like the skill loader does."""
+    if SKILL_MODULE not in sys.modules:
+        spec = importlib.util.spec_from_file_location(
+            SKILL_MODULE, ROOT / "__init__.py", submodule_search_locations=[str(ROOT)]
+        )
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[SKILL_MODULE] = module
+        spec.loader.exec_module(module)
+    return sys.modules[SKILL_MODULE]
+
+
+class FakeClock:
+    """Clock replacing time.monotonic and time.time while installed."""
+
+    def __init__(self, start=1000000.0):
+        self.now = start
+        self._saved = None
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+    def install(self):
+        self._saved = (time.monotonic, time.time)
+        time.monotonic = self.monotonic
+        time.time = self.time
+
+    def uninstall(self):
+        if self._saved is not None:
+            time.monotonic, time.time = self._saved
+            self._saved = None
+
+
+class FakeScheduler:
+    """Synchronous stand-in for skill.scheduler.DeadlineScheduler.
+
+    Deadlines expire only when run_due() is called, on the fake clock.
+    """
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.armed = Counter()
+        self.fired = Counter()
+        self._entries = {}
+        self._heap = []
+        self._sequence = 0
+
+    def schedule(self, name, delay, callback, *args):
+        self._sequence += 1
+        deadline = self.clock.monotonic() + max(0, delay)
+        self._entries[name] = (deadline, self._sequence, callback, args)
+        heapq.heappush(self._heap, (deadline, self._sequence, name))
+        self.armed[name] += 1
+
+    def cancel(self, name):
+        self._entries.pop(name, None)
+
+    def remaining(self, name):
+        entry = self._entries.get(name)
+        if entry is None:
+            return None
+        return max(0, entry[0] - self.clock.monotonic())
+
+    def shutdown(self):
+        self._entries.clear()
+        self._heap.clear()
+
+    def run_due(self):
+        """Run the callbacks of the expired deadlines, in deadline order."""
+        while self._heap and self._heap[0][0] <= self.clock.monotonic():
+            _, sequence, name = heapq.heappop(self._heap)
+            entry = self._entries.get(name)
+            if entry is None or entry[1] != sequence:
+                continue
+            del self._entries[name]
+            self.fired[name] += 1
+            entry[2](*entry[3])
+
+
+class FakeBus:
+    """Messagebus client delivering messages in process.
+
+    Like the real bus, sent messages are also delivered to the handlers of
+    the sender, but only once the current handler returned.
+    """
+
+    def __init__(self):
+        self.handlers = defaultdict(list)
+        self.sent = []
+        self.latency = defaultdict(list)  # message type -> handler seconds
+        self._queue = []
+        self._delivering = False
+
+    def on(self, msg_type, handler):
+        self.handlers[msg_type].append(handler)
+
+    def once(self, msg_type, handler):
+        def run_once(message):
+            self.remove(msg_type, run_once)
+            handler(message)
+
+        self.on(msg_type, run_once)
+
+    def remove(self, msg_type, handler):
+        if handler in self.handlers.get(msg_type, ()):
+            self.handlers[msg_type].remove(handler)
+
+    def remove_all_listeners(self, msg_type):
+        self.handlers.pop(msg_type, None)
+
+    def emit(self, message):
+        self.sent.append(message)
+        self.deliver(message)
+
+    def wait_for_response(self, message, reply_type=None, timeout=None):
+        self.emit(message)
+        return None
+
+    def deliver(self, message):
+        """Pass a message to its handlers once the current handler returns."""
+        self._queue.append(message)
+        if self._delivering:
+            return
+        self._delivering = True
+        try:
+            while self._queue:
+                current = self._queue.pop(0)
+                for handler in list(self.handlers.get(current.msg_type, ())):
+                    start = time.perf_counter()
+                    handler(current)
+                    self.latency[current.msg_type].append(time.perf_counter() - start)
+        finally:
+            self._delivering = False
+
+    def sent_types(self, *msg_types):
+        return [message for message in self.sent if message.msg_type in msg_types]
+
+
+class SkillHarness:
+    """Run the Mark2 skill against a FakeBus, FakeScheduler and FakeClock.
+
+    The skill's files (IPC directory, user configuration, settings) are
+    redirected to a temporary directory, and the About page values are not
+    refreshed in the background so runs are reproducible.
+
+    Arguments:
+        tmp_dir (Path): directory for the files written by the skill
+        settings (dict): skill settings present when the skill starts
+    """
+
+    def __init__(self, tmp_dir, settings=None):
+        self.tmp_dir = Path(tmp_dir)
+        self.initial_settings = settings or {}
+        self.clock = FakeClock()
+        self.bus = FakeBus()
+        self.scheduler = FakeScheduler(self.clock)
+        self.module = None
+        self.skill = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *_):
+        self.stop()
+
+    def start(self):
+        """Create and start the skill."""
+        self.clock.install()
+        self.module = import_skill()
+        self.module.get_ipc_directory = lambda *_, **__: str(self.tmp_dir / "ipc")
+        self.module.DeviceInfoCache.refresh_async = lambda cache: None
+        self.skill = self.module.create_skill()
+        self.skill.settings.update(self.initial_settings)
+        self.skill.scheduler = self.scheduler
+        self.skill._startup(self.bus, SKILL_ID)
+        self.skill.settings_write_path = self.tmp_dir
+        self.skill.config_writer.path = str(self.tmp_dir / "mycroft.conf")
+        self.run_due()
+
+    def stop(self):
+        """Shut the skill down like the skill loader does."""
+        try:
+            if self.skill is not None:
+                self.skill.default_shutdown()
+        finally:
+            self.clock.uninstall()
+
+    def run_due(self):
+        """Run expired deadlines until none is left."""
+        before = None
+        while before != sum(self.scheduler.fired.values()):
+            before = sum(self.scheduler.fired.values())
+            self.scheduler.run_due()
+
+    def advance(self, seconds):
+        """Let time pass, running the deadlines expiring meanwhile."""
+        end = self.clock.now + seconds
+        while self.scheduler._heap and self.scheduler._heap[0][0] <= end:
+            self.clock.now = max(self.clock.now, self.scheduler._heap[0][0])
+            self.run_due()
+        self.clock.now = end
+        self.run_due()
+
+    def inject(self, msg_type, data=None):
+        """Send a message to the skill as another service would."""
+        data = dict(data or {})
+        if msg_type == "enclosure.mouth.viseme_list":
+            data.setdefault("start", self.clock.time())
+        self.bus.deliver(Message(msg_type, data))
+        self.run_due()
+
+    def change_settings(self, **values):
+        """Apply skill settings changed on the web."""
+        self.skill.settings.update(values)
+        if self.skill.settings_change_callback is not None:
+            self.skill.settings_change_callback()
+        self.run_due()
+
+    def replay(self, trace):
+        """Replay a trace and report what the skill did.
+
+        Arguments:
+            trace (iterable): (seconds since the previous message, message
+                              type, data) tuples
+
+        Returns:
+            dict: "handlers" latency in milliseconds by message type,
+                  "gui_messages" sent to the GUI, "scheduled" deadlines
+                  armed by name and "sent" message counts by type
+        """
+        self.bus.latency.clear()
+        first_sent = len(self.bus.sent)
+        armed = Counter(self.scheduler.armed)
+        for delay, msg_type, data in trace:
+            self.advance(delay)
+            self.inject(msg_type, data)
+        sent = Counter(message.msg_type for message in self.bus.sent[first_sent:])
+        return {
+            "handlers": {
+                msg_type: _summary(durations)
+                for msg_type, durations in self.bus.latency.items()
+            },
+            "gui_messages": sum(sent[msg_type] for msg_type in GUI_MESSAGES),
+            "scheduled": dict(self.scheduler.armed - armed),
+            "sent": dict(sent),
+        }
+
+    def gui_value(self, key, default=None):
+        """Get a GUI session value of the skill."""
+        return self.skill.gui[key] if key in self.skill.gui else default
+
+
+def _summary(durations):
+    durations = sorted(durations)
+    return {
+        "count": len(durations),
+        "mean_ms": sum(durations) / len(durations) * 1000,
+        "max_ms": durations[-1] * 1000,
+    }
+
+
+def conversation_trace(turns=10, skill_id="mycroft-weather.mycroftai"):
+    """Synthetic trace of spoken interactions with a Skill.
+
+    Each turn runs a handler which shows a page and speaks two chunks.
+    Viseme lists get their playback "start" time when they are replayed.
+    """
+    trace = []
+    for turn in range(turns):
+        handler = "WeatherSkill.handle_current_weather"
+        trace += [
+            (5, "mycroft.skill.handler.start", {"handler": handler}),
+            (
+                0.2,
+                "gui.page.show",
+                {"page": ["weather.qml"], "__from": skill_id, "index": 0},
+            ),
+            (0.3, "recognizer_loop:audio_output_start", {}),
+            (
+                0,
+                "enclosure.mouth.viseme_list",
+                {"visemes": [["0", 0.5], ["3", 1.2], ["4", 2.0]]},
+            ),
+            (0.1, "mycroft.skill.handler.complete", {"handler": handler}),
+            (1.9, "recognizer_loop:audio_output_end", {}),
+            (0.1, "recognizer_loop:audio_output_start", {}),
+            (0, "enclosure.mouth.viseme_list", {"visemes": [["2", 1.5]]}),
+            (1.5, "recognizer_loop:audio_output_end", {}),
+            (0.1, "gui.page_interaction", {"__from": skill_id}),
+        ]
+    return trace
+
+
+def idle_registration_trace(screens):
+    """Trace of Skills answering a mycroft.mark2.collect_idle request.
+
+    Arguments:
+        screens (list): (name, screen id) pairs, in registration order
+    """
+    return [
+        (0.05, "mycroft.mark2.register_idle", {"name": name, "id": screen_id})
+        for name, screen_id in screens
+    ]
@@ -0,0 +1,53 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Auto brightness changed by voice and by web settings syncs."""
+
+from harness import SkillHarness
+
+
+def test_voice_change_survives_settings_sync(harness):
+    harness.skill.handle_auto_brightness(None)
+
+    # The web still has the default and sends it with every sync
+    harness.change_settings(auto_brightness=False)
+    harness.change_settings(auto_brightness=False)
+
+    assert harness.skill.auto_brightness
+    assert harness.skill.settings["auto_brightness"] is True
+    assert harness.scheduler.remaining("Sunrise") is not None
+
+
+def test_web_change_is_followed(harness):
+    harness.change_settings(auto_brightness=True)
+    assert harness.skill.auto_brightness
+
+    harness.skill._stop_auto_brightness()  # "Set brightness to 50%"
+    harness.change_settings(auto_brightness=True)
+    assert not harness.skill.auto_brightness
+
+    harness.change_settings(auto_brightness=False)
+    harness.change_settings(auto_brightness=True)
+    assert harness.skill.auto_brightness
+
+
+def test_enabled_by_voice_resumes_after_reload(tmp_path):
+    with SkillHarness(tmp_path) as harness:
+        harness.skill.handle_auto_brightness(None)
+        harness.change_settings(auto_brightness=False)
+        settings = dict(harness.skill.settings)
+
+    with SkillHarness(tmp_path, settings=settings) as harness:
+        # First sync after boot, the web value did not change
+        harness.change_settings(auto_brightness=False)
+        assert harness.skill.auto_brightness
@@ -0,0 +1,83 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Parse the brightness values of every locale's brightness.intent."""
+
+import re
+from pathlib import Path
+
+import pytest
+
+from skill.brightness import AUTO, INVALID, LEVEL, PERCENT, BrightnessParser
+
+LOCALE_DIR = Path(__file__).resolve().parent.parent / "locale"
+LANGUAGES = sorted(path.parent.name for path in LOCALE_DIR.glob("*/brightness.intent"))
+
+# Optional group following or preceding the {brightness} entity, such as
+# "(percent|)". The sv-se file has a "[percent}" typo, accept it too.
+GROUP_AFTER = re.compile(r"\{brightness\}\s*[(\[]([^)}\]]*)[)}\]]")
+GROUP_BEFORE = re.compile(r"[(\[]([^)}\]]*)[)}\]]\s*\{brightness\}")
+
+
+def percent_phrases(lang):
+    """Build "50 percent" like phrases from the lines of a brightness.intent.
+
+    The words around the entity come from the group after it, or the group
+    before it for languages putting the percent word first (eu-eu).
+    """
+    phrases = set()
+    intent_path = LOCALE_DIR / lang / "brightness.intent"
+    for line in intent_path.read_text(encoding="utf-8").splitlines():
+        after = GROUP_AFTER.search(line)
+        before = None if after else GROUP_BEFORE.search(line)
+        for group, template in ((after, "50 {}"), (before, "{} 50")):
+            if group is None:
+                continue
+            for word in group.group(1).split("|"):
+                if word.strip():
+                    phrases.add(template.format(word.strip().lower()))
+    return sorted(phrases)
+
+
+@pytest.fixture(scope="module")
+def parser():
+    return BrightnessParser(str(LOCALE_DIR))
+
+
+@pytest.mark.parametrize("lang", LANGUAGES)
+def test_percent_words(parser, lang):
+    phrases = percent_phrases(lang)
+    assert phrases, "No percent word found for " + lang
+    for phrase in phrases:
+        assert parser.parse(phrase, lang) == (PERCENT, 50), phrase
+
+
+@pytest.mark.parametrize("lang", LANGUAGES)
+def test_level_names(parser, lang):
+    for name, percent in parser.levels[lang].items():
+        expected = (AUTO, None) if percent < 0 else (PERCENT, percent)
+        assert parser.parse(name, lang) == expected, name
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("50%", (PERCENT, 50)),
+        ("12", (LEVEL, 40)),
+        ("75", (PERCENT, 75)),
+        ("150", (INVALID, None)),
+        ("blue", (INVALID, None)),
+    ],
+)
+def test_numbers(parser, text, expected):
+    assert parser.parse(text, "en-us") == expected
@@ -0,0 +1,115 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Fade the brightness of a file backlight on the fake clock."""
+
+import pytest
+
+from harness import FakeClock, FakeScheduler
+from skill.brightness import BrightnessController, FileBrightnessSink
+
+MIN_INTERVAL = 0.1
+
+
+class RecordingSink(FileBrightnessSink):
+    """File sink also recording the time and value of each write."""
+
+    def __init__(self, path, clock):
+        super().__init__(path, max_value=255)
+        self.clock = clock
+        self.writes = []
+
+    def write(self, level):
+        super().write(level)
+        self.writes.append((self.clock.now, int(self.path.read_text())))
+
+
+@pytest.fixture
+def clock():
+    fake_clock = FakeClock()
+    fake_clock.install()
+    yield fake_clock
+    fake_clock.uninstall()
+
+
+@pytest.fixture
+def scheduler(clock):
+    return FakeScheduler(clock)
+
+
+@pytest.fixture
+def sink(tmp_path, clock):
+    return RecordingSink(tmp_path / "brightness", clock)
+
+
+@pytest.fixture
+def controller(sink, scheduler):
+    return BrightnessController(sink, scheduler, min_interval=MIN_INTERVAL)
+
+
+def run(clock, scheduler, seconds, tick=0.01):
+    """Advance the clock in small ticks, running the expired deadlines."""
+    for _ in range(round(seconds / tick)):
+        clock.advance(tick)
+        scheduler.run_due()
+
+
+def test_writes_are_min_interval_apart(controller, sink, clock, scheduler):
+    controller.set_level(0)
+    controller.set_level(30, ramp=1)
+    run(clock, scheduler, 2)
+
+    times = [write_time for write_time, _ in sink.writes]
+    gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+    assert min(gaps) >= MIN_INTERVAL - 1e-9
+    # One write per interval during the 1 s fade, ending at full brightness
+    assert len(sink.writes) <= 1 + 1 / MIN_INTERVAL + 1
+    assert sink.writes[-1][1] == 255
+    assert sink.path.read_text() == "255"
+
+
+def test_new_level_during_fade_retargets(controller, sink, clock, scheduler):
+    controller.set_level(0)
+    controller.set_level(30, ramp=1)
+    run(clock, scheduler, 0.5)
+    written = len(sink.writes)
+    peak = sink.writes[-1][1]
+
+    controller.set_level(10, ramp=1)
+    # Retargeted in place: still one pending step and no extra write
+    assert len(sink.writes) == written
+    assert scheduler.remaining("BrightnessRamp") is not None
+    run(clock, scheduler, 2)
+
+    # The fade turned around where it was, it never reached the old target
+    values = [value for _, value in sink.writes[written:]]
+    assert max(values) <= peak
+    assert values == sorted(values, reverse=True)
+    assert values[-1] == 85  # level 10 of 30 on a 255 backlight
+    assert controller.level == 10
+
+
+def test_unchanged_level_is_not_written(controller, sink, clock, scheduler):
+    controller.set_level(20)
+    run(clock, scheduler, 1)
+    assert len(sink.writes) == 1
+
+    controller.set_level(20)
+    controller.set_level(20, ramp=1)
+    run(clock, scheduler, 2)
+    assert len(sink.writes) == 1
+
+    # A slow fade over two levels only writes when the level changes
+    controller.set_level(22, ramp=2)
+    run(clock, scheduler, 3)
+    assert [value for _, value in sink.writes] == [170, 178, 187]
@@ -0,0 +1,105 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Show the thinking animation while the handlers of other skills run."""
+
+from harness import idle_registration_trace
+from skill.busy import BUSY_DELAY, STALE_AFTER
+
+HOMESCREEN = ("Mycroft Homescreen", "mycroft-homescreen.mycroftai")
+WEATHER = "WeatherSkill.handle_current_weather"
+TIMER = "TimerSkill.handle_start_timer"
+
+
+def start(harness, handler):
+    harness.inject("mycroft.skill.handler.start", {"handler": handler})
+
+
+def complete(harness, handler):
+    harness.inject("mycroft.skill.handler.complete", {"handler": handler})
+
+
+def thinking_shown(harness):
+    """Number of times all.qml was shown in the thinking state."""
+    sent = harness.bus.sent
+    return sum(
+        1
+        for values, show in zip(sent, sent[1:])
+        if show.msg_type == "gui.page.show" and values.data.get("state") == "thinking"
+    )
+
+
+def test_fast_handler_shows_nothing(harness):
+    start(harness, WEATHER)
+    harness.advance(BUSY_DELAY / 2)
+    complete(harness, WEATHER)
+    harness.advance(10)
+
+    assert thinking_shown(harness) == 0
+    assert harness.scheduler.fired["BusyOnset"] == 0
+
+
+def test_slow_handler_shows_thinking_once(harness):
+    start(harness, WEATHER)
+    harness.advance(BUSY_DELAY * 5)
+    complete(harness, WEATHER)
+    harness.advance(10)
+
+    assert thinking_shown(harness) == 1
+    assert harness.skill.busy.durations[WEATHER].count == 1
+
+
+def test_overlapping_handlers_show_thinking_once(harness):
+    start(harness, WEATHER)
+    harness.advance(BUSY_DELAY / 2)
+    start(harness, TIMER)
+    harness.advance(BUSY_DELAY * 2)
+    complete(harness, WEATHER)
+    harness.advance(BUSY_DELAY * 2)
+    assert harness.skill.busy.busy
+    complete(harness, TIMER)
+    harness.advance(10)
+
+    assert thinking_shown(harness) == 1
+    assert not harness.skill.busy.busy
+
+
+def test_settle_time_arms_idle_check(harness):
+    settle = harness.module.BUSY_SETTLE
+    harness.replay(idle_registration_trace([HOMESCREEN]))
+    idle = len(harness.bus.sent_types("mycroft-homescreen.mycroftai.idle"))
+    start(harness, WEATHER)
+    harness.advance(BUSY_DELAY * 2)
+    complete(harness, WEATHER)
+
+    assert harness.scheduler.remaining("IdleCheck") == settle
+    harness.advance(settle)
+    assert len(harness.bus.sent_types("mycroft-homescreen.mycroftai.idle")) == idle + 1
+
+
+def test_start_without_completion_is_dropped(harness):
+    start(harness, WEATHER)
+    harness.advance(BUSY_DELAY * 2)
+    assert harness.skill.busy.busy
+    idle_checks = harness.scheduler.fired["IdleCheck"]
+
+    harness.advance(STALE_AFTER)
+    assert harness.skill.busy.in_flight == 0
+    assert not harness.skill.busy.busy
+    # Left like a completed handler, through the settle time
+    assert harness.scheduler.fired["IdleCheck"] == idle_checks + 1
+    # A late completion is ignored, the next slow handler shows it again
+    complete(harness, WEATHER)
+    start(harness, TIMER)
+    harness.advance(BUSY_DELAY * 2)
+    assert thinking_shown(harness) == 2
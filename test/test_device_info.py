@@ -0,0 +1,36 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from skill import device_info
+from skill.device_info import DeviceInfoCache
+
+
+def test_refresh_async_skips_running_refresh(monkeypatch, tmp_path):
+    started = []
+    monkeypatch.setattr(
+        device_info, "Thread", lambda **kwargs: started.append(kwargs) or _NoThread()
+    )
+    cache = DeviceInfoCache(str(tmp_path))
+
+    with cache._refresh_lock:
+        cache.refresh_async()
+    assert started == []
+
+    cache.refresh_async()
+    assert len(started) == 1
+
+
+class _NoThread:
+    def start(self):
+        pass
@@ -0,0 +1,110 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Replay bus messages through the MessageDispatcher."""
+
+from collections import Counter
+
+from mycroft.messagebus.message import Message
+
+from harness import FakeBus, conversation_trace
+from skill.dispatch import MessageDispatcher
+
+MARK2_ID = "mycroft-mark-2.mycroftai"
+IGNORED_HANDLERS = ("Mark2", "TimeSkill.update_display")
+
+
+def replay(bus, trace):
+    for _, msg_type, data in trace:
+        bus.deliver(Message(msg_type, dict(data)))
+
+
+def noise_trace(count):
+    """Messages the Mark2 skill must drop: its own handlers and pages."""
+    trace = []
+    for _ in range(count):
+        trace += [
+            (0, "mycroft.skill.handler.start", {"handler": "Mark2.handle_idle"}),
+            (0, "mycroft.skill.handler.start", {"handler": "TimeSkill.update_display"}),
+            (0, "gui.page.show", {"page": ["all.qml"], "__from": MARK2_ID}),
+        ]
+    return trace
+
+
+def make_dispatcher(bus, received):
+    def record(message):
+        received[message.msg_type] += 1
+
+    dispatcher = MessageDispatcher(bus)
+    dispatcher.add(
+        "mycroft.skill.handler.start", record, ignored_handlers=IGNORED_HANDLERS
+    )
+    dispatcher.add("gui.page.show", record, ignored_origins=[MARK2_ID])
+    dispatcher.add("enclosure.mouth.viseme_list", record)
+    dispatcher.add("gui.page_interaction", record)
+    return dispatcher
+
+
+def test_replay_routes_and_drops():
+    bus = FakeBus()
+    received = Counter()
+    observed = []
+    dispatcher = make_dispatcher(bus, received)
+    dispatcher.observe("gui.page.show", observed.append)
+
+    replay(bus, conversation_trace(turns=10) + noise_trace(5))
+
+    assert received == {
+        "mycroft.skill.handler.start": 10,
+        "gui.page.show": 10,
+        "enclosure.mouth.viseme_list": 20,
+        "gui.page_interaction": 10,
+    }
+    # Observers see the dropped pages too
+    assert len(observed) == 15
+    stats = dispatcher.stats()
+    assert stats["mycroft.skill.handler.start"] == {
+        "received": 20,
+        "dropped": 10,
+        "failed": 0,
+    }
+    assert stats["gui.page.show"] == {"received": 15, "dropped": 5, "failed": 0}
+    # Topics without a route are never subscribed
+    assert "recognizer_loop:audio_output_start" not in stats
+
+
+def test_failing_handler_is_counted():
+    bus = FakeBus()
+    dispatcher = MessageDispatcher(bus)
+    calls = []
+
+    def fail(message):
+        calls.append(message)
+        raise ValueError("broken handler")
+
+    dispatcher.add("gui.page_interaction", fail)
+    replay(bus, [(0, "gui.page_interaction", {})] * 3)
+
+    assert len(calls) == 3
+    assert dispatcher.stats()["gui.page_interaction"]["failed"] == 3
+
+
+def test_shutdown_unsubscribes():
+    bus = FakeBus()
+    received = Counter()
+    dispatcher = make_dispatcher(bus, received)
+    dispatcher.shutdown()
+
+    replay(bus, conversation_trace(turns=2))
+    assert not received
+    assert not any(bus.handlers.values())
@@ -0,0 +1,78 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import shutil
+import subprocess
+
+import pytest
+
+from skill.git_metadata import (
+    find_git_dir,
+    read_commit_timestamp,
+    read_head,
+    read_object,
+)
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="needs git")
+
+
+def git(repo, *args):
+    return subprocess.run(
+        ["git", "-C", str(repo), *args], check=True, capture_output=True
+    ).stdout
+
+
+@pytest.fixture(scope="module")
+def packed_repo(tmp_path_factory):
+    """Repository whose objects are packed, with delta chains."""
+    repo = tmp_path_factory.mktemp("repo")
+    git(repo, "init", "-q", "-b", "main")
+    git(repo, "config", "user.email", "test@example.com")
+    git(repo, "config", "user.name", "Test")
+    lines = ["line {}\n".format(number) for number in range(400)]
+    for commit in range(12):
+        lines[commit * 7] = "changed in commit {}\n".format(commit)
+        (repo / "file.txt").write_text("".join(lines))
+        git(repo, "add", "file.txt")
+        git(repo, "commit", "-q", "-m", "commit {}".format(commit))
+    git(repo, "gc", "-q", "--aggressive")
+    git(repo, "commit", "-q", "--allow-empty", "-m", "loose commit")
+    return repo
+
+
+def test_head(packed_repo):
+    branch, sha = read_head(find_git_dir(str(packed_repo)))
+    assert branch == "main"
+    assert sha == git(packed_repo, "rev-parse", "HEAD").decode().strip()
+
+
+def test_objects_match_git(packed_repo):
+    git_dir = find_git_dir(str(packed_repo))
+    listing = git(
+        packed_repo, "cat-file", "--batch-all-objects", "--batch-check"
+    ).decode()
+    for line in listing.splitlines():
+        sha, obj_type, _ = line.split()
+        assert read_object(git_dir, sha) == (
+            obj_type,
+            git(packed_repo, "cat-file", obj_type, sha),
+        )
+
+
+def test_commit_timestamp(packed_repo):
+    git_dir = find_git_dir(str(packed_repo))
+    for ref in ("HEAD", "HEAD~1", "HEAD~12"):
+        sha = git(packed_repo, "rev-parse", ref).decode().strip()
+        expected = int(git(packed_repo, "log", "-1", "--format=%ct", sha))
+        assert read_commit_timestamp(git_dir, sha) == expected
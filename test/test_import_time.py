@@ -0,0 +1,76 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Skill load time budget.
+
+The skill loads after mycroft-core, and the resting screen only shows once
+it did, so the skill must not pull heavy modules in at import.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+TEST_DIR = Path(__file__).resolve().parent
+# Modules only needed by auto brightness or the About page
+DEFERRED = ("astral", "pytz", "git", "pyaudio", "mycroft.api")
+IMPORT_BUDGET_MS = 200
+# Core modules already loaded by the skill loader when the skill loads
+CORE_MODULES = (
+    "mycroft",
+    "mycroft.configuration.config",
+    "mycroft.messagebus.message",
+    "mycroft.skills.settings",
+    "mycroft.util",
+    "mycroft.util.log",
+    "mycroft.version",
+)
+SCRIPT = """
+import importlib, json, sys, time
+sys.path.insert(0, {test_dir!r})
+for name in {core_modules!r}:
+    importlib.import_module(name)
+import harness
+before = set(sys.modules)
+start = time.perf_counter()
+harness.import_skill()
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": elapsed * 1000, "modules": sorted(set(sys.modules) - before)}}))
+"""
+
+
+def measure_import():
+    script = SCRIPT.format(test_dir=str(TEST_DIR), core_modules=CORE_MODULES)
+    output = subprocess.run(
+        [sys.executable, "-c", script], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output)
+
+
+def test_heavy_modules_are_deferred():
+    modules = measure_import()["modules"]
+    loaded = [
+        name
+        for name in modules
+        if any(
+            name == deferred or name.startswith(deferred + ".") for deferred in DEFERRED
+        )
+    ]
+    assert loaded == []
+
+
+def test_import_time_budget():
+    # Best of three, the first run also pays for the bytecode compilation
+    elapsed = min(measure_import()["ms"] for _ in range(3))
+    assert elapsed < IMPORT_BUDGET_MS
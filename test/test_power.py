@@ -0,0 +1,89 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Run the ShutdownCoordinator with a runner recording the command."""
+
+import time
+from threading import Event
+
+from skill.power import SYSTEMCTL, ShutdownCoordinator
+
+
+class StubRunner:
+    """Record the system commands instead of running them."""
+
+    def __init__(self):
+        self.commands = []
+
+    def __call__(self, command):
+        self.commands.append(command)
+        return 0
+
+
+def test_steps_run_before_the_command():
+    runner = StubRunner()
+    done = []
+    coordinator = ShutdownCoordinator(
+        {"settings": lambda: done.append("settings")}, runner=runner
+    )
+
+    result = coordinator.run("reboot", lambda: done.append("announcement"))
+
+    assert result == 0
+    assert sorted(done) == ["announcement", "settings"]
+    assert runner.commands == [[SYSTEMCTL, "reboot"]]
+
+
+def test_steps_run_in_parallel():
+    runner = StubRunner()
+    steps = {name: lambda: time.sleep(0.2) for name in ("settings", "config")}
+    coordinator = ShutdownCoordinator(steps, runner=runner)
+
+    start = time.monotonic()
+    coordinator.run("poweroff", lambda: time.sleep(0.2))
+
+    assert time.monotonic() - start < 0.5
+    assert runner.commands == [[SYSTEMCTL, "poweroff"]]
+
+
+def test_failing_step_does_not_block_the_command():
+    runner = StubRunner()
+    done = []
+
+    def fail():
+        raise OSError("read only file system")
+
+    coordinator = ShutdownCoordinator(
+        {"settings": fail, "config": lambda: done.append("config")}, runner=runner
+    )
+
+    coordinator.run("poweroff")
+
+    assert done == ["config"]
+    assert runner.commands == [[SYSTEMCTL, "poweroff"]]
+
+
+def test_command_runs_at_the_deadline():
+    runner = StubRunner()
+    release = Event()
+    coordinator = ShutdownCoordinator(
+        {"stuck": release.wait}, runner=runner, deadline=0.2
+    )
+
+    start = time.monotonic()
+    coordinator.run("reboot")
+    elapsed = time.monotonic() - start
+    release.set()
+
+    assert 0.2 <= elapsed < 1
+    assert runner.commands == [[SYSTEMCTL, "reboot"]]
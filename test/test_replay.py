@@ -0,0 +1,92 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from harness import conversation_trace, idle_registration_trace
+
+HOMESCREEN = ("Mycroft Homescreen", "mycroft-homescreen.mycroftai")
+
+
+def test_selected_screen_shown_once_registered(harness):
+    harness.replay(idle_registration_trace([HOMESCREEN]))
+    assert harness.bus.sent_types("mycroft-homescreen.mycroftai.idle")
+
+
+def test_conversation_report(harness):
+    harness.replay(idle_registration_trace([HOMESCREEN]))
+    report = harness.replay(conversation_trace(turns=3))
+
+    assert report["handlers"]["gui.page.show"]["count"] >= 3
+    assert report["handlers"]["enclosure.mouth.viseme_list"]["count"] == 6
+    assert report["gui_messages"] > 0
+    assert report["scheduled"]["IdleCheck"] >= 3
+
+
+def test_conversation_returns_to_resting_screen(harness):
+    harness.replay(idle_registration_trace([HOMESCREEN]))
+    shown = len(harness.bus.sent_types("mycroft-homescreen.mycroftai.idle"))
+    harness.replay(conversation_trace(turns=1))
+    harness.advance(30)
+    idle = harness.bus.sent_types("mycroft-homescreen.mycroftai.idle")
+    assert len(idle) == shown + 1
+
+
+def test_cold_collect_waits_for_selected_screen(harness):
+    harness.replay(
+        idle_registration_trace([("Other Screen", "other.skill"), HOMESCREEN])
+    )
+    assert harness.bus.sent_types("mycroft-homescreen.mycroftai.idle")
+    assert not harness.bus.sent_types("other.skill.idle")
+
+
+def test_collect_ends_at_deadline_without_selected_screen(harness):
+    harness.replay(idle_registration_trace([("Other Screen", "other.skill")]))
+    assert harness.skill.resting_screen.collecting
+    harness.advance(2)
+    assert harness.skill.resting_screen.collecting is False
+
+
+def test_speech_stop_ends_speaking_session(harness):
+    harness.replay(idle_registration_trace([HOMESCREEN]))
+    shown = len(harness.bus.sent_types("mycroft-homescreen.mycroftai.idle"))
+    harness.replay(
+        [
+            (1, "recognizer_loop:audio_output_start", {}),
+            (0, "enclosure.mouth.viseme_list", {"visemes": [["0", 0.5], ["3", 2.0]]}),
+        ]
+    )
+    assert harness.skill.speaking.active
+
+    speaking = harness.skill.speaking
+    reasons = []
+    end = speaking.end
+    speaking.end = lambda reason: reasons.append(reason) or end(reason)
+    harness.inject("mycroft.audio.speech.stop")
+    assert reasons == ["stop"]
+    assert not speaking.active
+    assert harness.skill.dispatcher.stats()["mycroft.audio.speech.stop"]["failed"] == 0
+    idle = harness.bus.sent_types("mycroft-homescreen.mycroftai.idle")
+    assert len(idle) == shown + 1
+
+
+def test_page_after_shown_idle_arms_shorter_check(harness):
+    harness.replay(idle_registration_trace([HOMESCREEN]))
+    harness.skill.start_idle_event(120)
+    harness.inject("mycroft.device.show.idle")
+    shown = len(harness.bus.sent_types("mycroft-homescreen.mycroftai.idle"))
+
+    harness.inject("gui.page_interaction", {"__from": "mycroft-weather.mycroftai"})
+    assert harness.scheduler.remaining("IdleCheck") == 30
+    harness.advance(200)
+    idle = harness.bus.sent_types("mycroft-homescreen.mycroftai.idle")
+    assert len(idle) == shown + 1
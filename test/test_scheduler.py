@@ -0,0 +1,88 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from threading import Event
+
+from skill.scheduler import DeadlineScheduler
+
+
+def wait_for(event, timeout=2):
+    assert event.wait(timeout), "callback not called"
+
+
+def test_callback_runs_after_delay():
+    scheduler = DeadlineScheduler()
+    fired = Event()
+    start = time.monotonic()
+    scheduler.schedule("Test", 0.05, fired.set)
+    wait_for(fired)
+    assert time.monotonic() - start >= 0.05
+    scheduler.shutdown()
+
+
+def test_rearm_replaces_deadline():
+    scheduler = DeadlineScheduler()
+    calls = []
+    done = Event()
+    scheduler.schedule("Test", 0.05, calls.append, "first")
+    scheduler.schedule("Test", 0.1, calls.append, "second")
+    scheduler.schedule("Done", 0.2, done.set)
+    wait_for(done)
+    assert calls == ["second"]
+    scheduler.shutdown()
+
+
+def test_cancel_and_remaining():
+    scheduler = DeadlineScheduler()
+    calls = []
+    scheduler.schedule("Test", 10, calls.append, "called")
+    assert 9 < scheduler.remaining("Test") <= 10
+    scheduler.cancel("Test")
+    assert scheduler.remaining("Test") is None
+    scheduler.shutdown()
+
+
+def test_failing_callback_does_not_stop_scheduler():
+    scheduler = DeadlineScheduler()
+    done = Event()
+    scheduler.schedule("Failing", 0, lambda: 1 / 0)
+    scheduler.schedule("Done", 0.01, done.set)
+    wait_for(done)
+    scheduler.shutdown()
+
+
+def test_callbacks_run_in_deadline_order():
+    scheduler = DeadlineScheduler()
+    calls = []
+    done = Event()
+    for name, delay in (("c", 0.03), ("a", 0.01), ("b", 0.02)):
+        scheduler.schedule(name, delay, calls.append, name)
+    scheduler.schedule("Done", 0.05, done.set)
+    wait_for(done)
+    assert calls == ["a", "b", "c"]
+    scheduler.shutdown()
+
+
+def test_rearm_rate():
+    """Re-arming the idle check must keep up with bursts of bus messages."""
+    scheduler = DeadlineScheduler()
+    scheduler.schedule("IdleCheck", 30, lambda: None)
+    start = time.perf_counter()
+    for _ in range(10000):
+        scheduler.schedule("IdleCheck", 30, lambda: None)
+    elapsed = time.perf_counter() - start
+    scheduler.shutdown()
+    # 1000 re-arms per second would allow a whole second
+    assert elapsed < 1
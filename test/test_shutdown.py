@@ -0,0 +1,46 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Skill shutdown and reload with writes still waiting for their deadline."""
+
+import json
+
+from harness import SkillHarness, idle_registration_trace
+
+HOMESCREEN = ("Mycroft Homescreen", "mycroft-homescreen.mycroftai")
+
+
+def test_shutdown_writes_pending_changes(tmp_path):
+    with SkillHarness(tmp_path) as harness:
+        harness.inject(
+            "mycroft.mark2.register_idle", {"name": HOMESCREEN[0], "id": HOMESCREEN[1]}
+        )
+        harness.skill.settings["use_listening_beep"] = False
+        harness.skill.on_websettings_changed()
+        # Shut down before the snapshot and configuration deadlines
+        assert harness.scheduler.remaining("IdleSnapshot") is not None
+        assert harness.scheduler.remaining("ConfigWrite") is not None
+
+    snapshot_path = tmp_path / "ipc" / "mark2" / "resting_screens.json"
+    assert HOMESCREEN[0] in snapshot_path.read_text()
+    config = json.loads((tmp_path / "mycroft.conf").read_text())
+    assert config["confirm_listening"] is False
+
+
+def test_reload_shows_resting_screen_immediately(tmp_path):
+    with SkillHarness(tmp_path) as harness:
+        harness.replay(idle_registration_trace([HOMESCREEN]))
+
+    with SkillHarness(tmp_path) as harness:
+        # Shown from the snapshot, before any Skill answered the collect
+        assert harness.bus.sent_types("mycroft-homescreen.mycroftai.idle")
@@ -0,0 +1,114 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+pytz = pytest.importorskip("pytz")
+pytest.importorskip("astral")
+
+from skill.solar import BRIGHTNESS_EVENTS, SolarSchedule  # noqa: E402
+
+NEW_YORK = {
+    "coordinate": {"latitude": 40.7128, "longitude": -74.006},
+    "timezone": {"code": "America/New_York", "offset": -18000000},
+}
+EASTERN = pytz.timezone("America/New_York")
+
+
+@pytest.fixture(autouse=True)
+def device_in_new_york(monkeypatch):
+    """Run with the device clock in the configured timezone."""
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def local(*args):
+    return EASTERN.localize(datetime(*args))
+
+
+def sunrises(timeline):
+    return [when for when, name, _ in timeline if name == "Sunrise"]
+
+
+def check_ordered(timeline, now):
+    times = [when for when, _, _ in timeline]
+    assert times == sorted(times)
+    assert all(when > now for when in times)
+    names = [name for _, name, _ in timeline]
+    # Sunrise, noon and sunset alternate whatever the clock change does
+    cycle = [name for name, _, _ in BRIGHTNESS_EVENTS]
+    start = cycle.index(names[0])
+    assert names == [cycle[(start + i) % 3] for i in range(len(names))]
+
+
+def test_spring_forward():
+    now = local(2021, 3, 13, 5, 0)
+    timeline = SolarSchedule().timeline(NEW_YORK, 6, now)
+    check_ordered(timeline, now)
+    first, second = sunrises(timeline)
+    assert first.utcoffset() == timedelta(hours=-5)
+    assert second.utcoffset() == timedelta(hours=-4)
+    # The clock skips an hour: the wall clock sunrise moves an hour later
+    # although only about a minute less than a day passed.
+    assert timedelta(hours=23, minutes=55) < second - first < timedelta(hours=24)
+    assert second.astimezone(EASTERN).hour == 7
+
+
+def test_fall_back():
+    now = local(2021, 11, 6, 5, 0)
+    timeline = SolarSchedule().timeline(NEW_YORK, 6, now)
+    check_ordered(timeline, now)
+    first, second = sunrises(timeline)
+    assert first.utcoffset() == timedelta(hours=-4)
+    assert second.utcoffset() == timedelta(hours=-5)
+    assert timedelta(hours=24) < second - first < timedelta(hours=24, minutes=5)
+    assert second.astimezone(EASTERN).hour == 6
+
+
+def test_next_event_during_skipped_hour():
+    now = local(2021, 3, 14, 3, 30)  # Just after the clocks went forward
+    when, level = SolarSchedule().next_event(NEW_YORK, "Sunrise", now)
+    assert level == 20
+    assert when.date() == now.date()
+    assert timedelta(0) < when - now < timedelta(hours=5)
+
+
+def test_next_event_after_sunset_is_tomorrow():
+    schedule = SolarSchedule()
+    sunset, _ = schedule.day(NEW_YORK, local(2021, 6, 1, 12).date())["Sunset"]
+    when, _ = schedule.next_event(NEW_YORK, "Sunrise", sunset + timedelta(minutes=1))
+    assert when.date() == (sunset + timedelta(days=1)).date()
+
+
+def test_days_computed_once(monkeypatch):
+    schedule = SolarSchedule()
+    computed = []
+    compute = SolarSchedule._compute_day
+    monkeypatch.setattr(
+        SolarSchedule,
+        "_compute_day",
+        staticmethod(lambda *args: computed.append(args[1]) or compute(*args)),
+    )
+    now = local(2021, 3, 13, 20, 0)
+    schedule.timeline(NEW_YORK, 3, now)
+    days = len(computed)
+    schedule.timeline(NEW_YORK, 3, now)
+    schedule.next_event(NEW_YORK, "Noon", now)
+    assert len(computed) == days
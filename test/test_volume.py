@@ -0,0 +1,72 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Replay volume changes through the skill's volume overlay."""
+
+from harness import GUI_MESSAGES
+
+
+def volume_sweep(steps=100, interval=0.01):
+    """Trace of a volume knob turned from 1% to 100%."""
+    return [
+        (interval, "mycroft.volume.set", {"percent": step / steps})
+        for step in range(1, steps + 1)
+    ]
+
+
+def test_sweep_is_coalesced_per_frame(harness):
+    harness.skill.gui.show_page("all.qml")
+    sent = len(harness.bus.sent)
+
+    report = harness.replay(volume_sweep())
+    harness.advance(3)
+
+    # 100 steps in one second: one update per 1/30 s frame, the last
+    # level and the hide
+    gui_messages = [
+        message
+        for message in harness.bus.sent[sent:]
+        if message.msg_type in GUI_MESSAGES
+    ]
+    assert len(gui_messages) == 32
+    assert report["scheduled"]["VolumeHide"] == 1
+    assert harness.gui_value("speakerVolume") == 100
+    assert harness.gui_value("volumeOverlay") is False
+
+
+def test_volume_query_reply_is_not_shown(harness):
+    harness.skill.gui.show_page("all.qml")
+    harness.replay([(1, "mycroft.volume.get.response", {"percent": 0.4})])
+    assert harness.skill.volume_overlay.updates == 0
+    assert not harness.gui_value("volumeOverlay")
+
+
+def test_sweep_over_homescreen_sends_nothing(harness):
+    harness.skill.gui.show_page("all.qml")
+    harness.inject(
+        "gui.page.show",
+        {"page": ["idle.qml"], "__from": "mycroft-homescreen.mycroftai", "index": 0},
+    )
+    sent = len(harness.bus.sent)
+
+    harness.replay(volume_sweep())
+    harness.advance(3)
+
+    gui_messages = [
+        message
+        for message in harness.bus.sent[sent:]
+        if message.msg_type in GUI_MESSAGES
+    ]
+    assert gui_messages == []
+    assert harness.skill.volume_overlay.updates == 0
+    assert harness.skill.volume_overlay.level == 100
@@ -0,0 +1,43 @@
+import QtQuick 2.4
+
+// Speaker volume shown over the current page while it changes
+Item {
+    id: overlay
+
+    property int level: 0
+    property bool shown: false
+
+    visible: opacity > 0
+    opacity: shown ? 1 : 0
+
+    Behavior on opacity {
+        NumberAnimation {
+            duration: 200
+        }
+    }
+
+    Rectangle {
+        id: track
+        anchors.right: parent.right
+        anchors.rightMargin: 24
+        anchors.verticalCenter: parent.verticalCenter
+        width: 24
+        height: parent.height / 2
+        radius: width / 2
+        color: "#33FFFFFF"
+
+        Rectangle {
+            anchors.bottom: parent.bottom
+            width: parent.width
+            height: parent.height * overlay.level / 100
+            radius: width / 2
+            color: "#40DBB0"
+
+            Behavior on height {
+                NumberAnimation {
+                    duration: 33
+                }
+            }
+        }
+    }
+}
@@ -8,15 +8,64 @@ Mycroft.Delegate {
     id: mainLoaderView
 
     property var pageToLoad: sessionData.state
+    property var preloadPages: sessionData.preloadPages || []
     property var idleScreenList: sessionData.idleScreenList
     property var activeIdle: sessionData.selectedScreen
 
-    contentItem: Loader {
-        id: rootLoader
+    // States shown often and quickly, their pages stay instantiated once
+    // loaded or preloaded and are only shown or hidden afterwards.
+    property var residentPages: ["speaking", "listening", "thinking"]
+
+    function isResident(page) {
+        return residentPages.indexOf(page) >= 0;
+    }
+
+    contentItem: Item {
+        Repeater {
+            model: mainLoaderView.residentPages
+
+            delegate: Loader {
+                id: residentLoader
+
+                property bool wanted: visible || mainLoaderView.preloadPages.indexOf(modelData) >= 0
+
+                anchors.fill: parent
+                visible: mainLoaderView.pageToLoad == modelData
+                // Preloading happens in the background, a page needed right
+                // away is completed synchronously.
+                asynchronous: !visible
+                active: false
+                source: modelData + ".qml"
+
+                onWantedChanged: {
+                    if (wanted) {
+                        active = true;
+                    }
+                }
+                Component.onCompleted: active = wanted
+            }
+        }
+
+        // Other pages, such as the settings pages, are loaded on demand
+        Loader {
+            id: rootLoader
+            anchors.fill: parent
+            asynchronous: true
+            visible: !mainLoaderView.isResident(mainLoaderView.pageToLoad)
+        }
+
+        // Drawn over the pages of this skill only, see skill/volume.py
+        VolumeOverlay {
+            anchors.fill: parent
+            level: sessionData.speakerVolume || 0
+            shown: sessionData.volumeOverlay || false
+        }
     }
 
     onPageToLoadChanged: {
         console.log(sessionData.state)
-        rootLoader.setSource(sessionData.state + ".qml")
+        if (!isResident(pageToLoad)) {
+            rootLoader.setSource(pageToLoad + ".qml")
+        }
     }
 }
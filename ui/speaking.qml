@@ -11,9 +11,15 @@ Item {
     property bool speaking: false
     property int ref_size: Math.min(root.width, root.height) / 2
 
-    property var startViseme: sessionData.viseme.start
-    onStartVisemeChanged: {
-        root.speaking = true;
+    property var viseme: sessionData.viseme
+    // Index of the viseme being shown in the current chunk
+    property int cursor: 0
+
+    onVisemeChanged: {
+        root.cursor = 0;
+        if (viseme.start > 0) {
+            root.speaking = true;
+        }
     }
 
     function getVisemeImg(viseme){
@@ -67,22 +73,17 @@ Item {
         running: root.speaking
         repeat: true
         onTriggered: {
-            var now = Date.now() / 1000;
-            var start = sessionData.viseme.start;
-            var offset = start;
-            // Compare viseme start/stop with current time and choose viseme
-            // appropriately
-            for (var i = 0; i < sessionData.viseme.visemes.length; i++) {
-                if (sessionData.viseme.start == 0)
-                    break;
-                if (now >= offset &&
-                        now < start + sessionData.viseme.visemes[i][1])
-                {
-                    mouth_viseme.width = getVisemeWidth(sessionData.viseme.visemes[i][0]);
-                    offset = start + sessionData.viseme.visemes[i][1];
-                    return
-                }
-            }
+            if (root.viseme.start == 0)
+                return;
+            // Milliseconds since the start of the utterance
+            var now = Date.now() - root.viseme.start * 1000;
+            var ends = root.viseme.ends;
+            // End times are sorted, move the cursor forward past the
+            // visemes that are already over
+            while (root.cursor < ends.length && now >= ends[root.cursor])
+                root.cursor++;
+            if (root.cursor < ends.length)
+                mouth_viseme.width = getVisemeWidth(root.viseme.codes[root.cursor]);
             // Outside of span show default smile
             //return Qt.resolvedUrl(getVisemeImg("Smile"));
         }
@@ -10,13 +10,59 @@ import org.kde.lottie 1.0
 Item {
     id: "thinking"
 
-    LottieAnimation {
-        id: thinkingAnimation
-        anchors.centerIn: parent
-        height: Math.min(parent.width, parent.height)
-        source: Qt.resolvedUrl("thinking.json")
-        loops: Animation.Infinite
-        fillMode: Image.PreserveAspectFit
-        running: true
+    // Pre-rendered sprite sheet, see skill/sprites.py
+    property var sprite: sessionData.thinkingSprite
+    // all.qml keeps this page loaded while other states are shown, only
+    // animate while it is on screen. False when the Loader is hidden.
+    property bool animating: visible
+
+    Loader {
+        anchors.fill: parent
+        sourceComponent: thinking.sprite ? spriteAnimation : lottieAnimation
+    }
+
+    Component {
+        id: lottieAnimation
+
+        Item {
+            LottieAnimation {
+                id: thinkingAnimation
+                anchors.centerIn: parent
+                height: Math.min(parent.width, parent.height)
+                source: Qt.resolvedUrl("thinking.json")
+                loops: Animation.Infinite
+                fillMode: Image.PreserveAspectFit
+                running: thinking.animating
+            }
+        }
+    }
+
+    Component {
+        id: spriteAnimation
+
+        Rectangle {
+            id: spriteCanvas
+            color: thinking.sprite.background
+
+            // Same placement as the Lottie animation it was rendered from
+            property real scale: Math.min(width, height) / thinking.sprite.height
+            property real originX: (width - thinking.sprite.width * scale) / 2
+            property real originY: (height - thinking.sprite.height * scale) / 2
+
+            AnimatedSprite {
+                x: spriteCanvas.originX + thinking.sprite.x * spriteCanvas.scale
+                y: spriteCanvas.originY + thinking.sprite.y * spriteCanvas.scale
+                width: thinking.sprite.frameWidth * spriteCanvas.scale
+                height: thinking.sprite.frameHeight * spriteCanvas.scale
+                source: Qt.resolvedUrl(thinking.sprite.source)
+                frameWidth: thinking.sprite.frameWidth
+                frameHeight: thinking.sprite.frameHeight
+                frameCount: thinking.sprite.frameCount
+                frameRate: thinking.sprite.frameRate
+                interpolate: false
+                loops: AnimatedSprite.Infinite
+                running: thinking.animating
+            }
+        }
     }
 }